@@ -2,12 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select
 from datetime import datetime, timedelta, timezone
 
 from app.db import get_db
 from app.auth import get_current_admin
-from app.models import ReviewEntry, ReviewCache
+from app.models import CleanupJob, ScrapeRun
+from app.schemas import CleanupJobOut, ScrapeRunOut, ScrapeRunTrend
+from app.cleanup import start_cleanup
+import hashlib
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -21,42 +24,156 @@ class CleanupRequest(BaseModel):
     older_than_days: Optional[int] = None  # if None, delete all matching
 
 
-@router.post("/cleanup")
+def _cleanup_job_out(j: CleanupJob) -> CleanupJobOut:
+    return CleanupJobOut(
+        id=j.id,
+        status=j.status,
+        params=j.params or {},
+        cancel_requested=bool(j.cancel_requested),
+        deleted_reviews=j.deleted_reviews or 0,
+        deleted_cache=j.deleted_cache or 0,
+        batches=j.batches or 0,
+        error=j.error,
+        created_at=j.created_at,
+        started_at=j.started_at,
+        updated_at=j.updated_at,
+        finished_at=j.finished_at,
+    )
+
+
+@router.post("/cleanup", response_model=CleanupJobOut, status_code=202)
 async def cleanup_data(
     req: CleanupRequest,
     _: None = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    total_reviews = 0
-    total_cache = 0
-
-    cutoff: Optional[datetime] = None
-    if req.older_than_days is not None:
-        try:
-            cutoff = datetime.now(timezone.utc) - timedelta(days=int(req.older_than_days))
-        except Exception:
-            cutoff = None
-
-    if req.delete_reviews:
-        stmt = delete(ReviewEntry)
-        if req.place_url:
-            stmt = stmt.where(ReviewEntry.place_url == str(req.place_url))
-        if req.locales:
-            stmt = stmt.where(ReviewEntry.locale.in_(req.locales))
-        if cutoff is not None:
-            stmt = stmt.where(ReviewEntry.scraped_at < cutoff)
-        res = await db.execute(stmt)
-        total_reviews = res.rowcount or 0
-
-    if req.delete_cache:
-        stmt = delete(ReviewCache)
-        if req.place_url:
-            stmt = stmt.where(ReviewCache.place_url == str(req.place_url))
-        if req.locales:
-            stmt = stmt.where(ReviewCache.locale.in_(req.locales))
-        res = await db.execute(stmt)
-        total_cache = res.rowcount or 0
-
+    """Queue a cleanup; rows are deleted in the background in small batches (see GET /admin/cleanup/{id})."""
+    job = CleanupJob(params=req.model_dump(), status="pending", cancel_requested=False, deleted_reviews=0, deleted_cache=0, batches=0)
+    db.add(job)
     await db.commit()
-    return {"success": True, "deleted": {"reviews": total_reviews, "cache": total_cache}}
+    await db.refresh(job)
+    start_cleanup(job.id)
+    return _cleanup_job_out(job)
+
+
+@router.get("/cleanup", response_model=list[CleanupJobOut])
+async def list_cleanup_jobs(
+    limit: int = 20,
+    _: None = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    res = await db.execute(select(CleanupJob).order_by(CleanupJob.id.desc()).limit(min(max(1, int(limit)), 200)))
+    return [_cleanup_job_out(j) for j in res.scalars().all()]
+
+
+@router.get("/cleanup/{job_id}", response_model=CleanupJobOut)
+async def cleanup_status(
+    job_id: int,
+    _: None = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    job = await db.get(CleanupJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Cleanup job not found")
+    return _cleanup_job_out(job)
+
+
+@router.post("/cleanup/{job_id}/cancel", response_model=CleanupJobOut)
+async def cancel_cleanup(
+    job_id: int,
+    _: None = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stop a cleanup after its current batch; rows already deleted stay deleted."""
+    job = await db.get(CleanupJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Cleanup job not found")
+    if job.status in ("pending", "running"):
+        job.cancel_requested = True
+        if job.status == "pending":
+            job.status = "cancelled"
+            job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(job)
+    return _cleanup_job_out(job)
+
+
+def _scrape_run_out(r: ScrapeRun) -> ScrapeRunOut:
+    return ScrapeRunOut(
+        id=r.id,
+        place_url=r.place_url,
+        locale=r.locale,
+        started_at=r.started_at,
+        duration_ms=r.duration_ms or 0,
+        phases=r.phases or {},
+        scroll_iterations=r.scroll_iterations or 0,
+        card_count=r.card_count or 0,
+        review_count=r.review_count or 0,
+        inserted_count=r.inserted_count or 0,
+        bytes_transferred=r.bytes_transferred or 0,
+        outcome=r.outcome or "",
+        error=r.error,
+    )
+
+
+@router.get("/scrape-runs/slowest", response_model=list[ScrapeRunOut])
+async def slowest_scrape_runs(
+    limit: int = 20,
+    days: int = 7,
+    locale: Optional[str] = None,
+    outcome: Optional[str] = None,
+    _: None = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max(1, int(days)))
+    stmt = select(ScrapeRun).where(ScrapeRun.started_at >= cutoff)
+    if locale:
+        stmt = stmt.where(ScrapeRun.locale == locale)
+    if outcome:
+        stmt = stmt.where(ScrapeRun.outcome == outcome)
+    stmt = stmt.order_by(ScrapeRun.duration_ms.desc()).limit(min(max(1, int(limit)), 500))
+    res = await db.execute(stmt)
+    return [_scrape_run_out(r) for r in res.scalars().all()]
+
+
+@router.get("/scrape-runs/trends", response_model=list[ScrapeRunTrend])
+async def scrape_run_trends(
+    place_url: str,
+    days: int = 30,
+    _: None = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    place_hash = hashlib.sha256(str(place_url).encode("utf-8")).hexdigest()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max(1, int(days)))
+    res = await db.execute(
+        select(ScrapeRun)
+        .where(ScrapeRun.place_url_hash == place_hash, ScrapeRun.started_at >= cutoff)
+        .order_by(ScrapeRun.started_at.asc())
+    )
+    # Aggregate per (day, locale) in Python to stay dialect-agnostic
+    buckets: dict[tuple[str, str], list[ScrapeRun]] = {}
+    for r in res.scalars().all():
+        day = r.started_at.date().isoformat() if r.started_at else "unknown"
+        buckets.setdefault((day, r.locale), []).append(r)
 
+    out: list[ScrapeRunTrend] = []
+    for (day, loc), runs in buckets.items():
+        durations = [r.duration_ms or 0 for r in runs]
+        phase_totals: dict[str, float] = {}
+        phase_counts: dict[str, int] = {}
+        for r in runs:
+            for name, secs in (r.phases or {}).items():
+                phase_totals[name] = phase_totals.get(name, 0.0) + float(secs or 0.0)
+                phase_counts[name] = phase_counts.get(name, 0) + 1
+        out.append(ScrapeRunTrend(
+            day=day,
+            locale=loc,
+            runs=len(runs),
+            failures=sum(1 for r in runs if r.outcome == "failure"),
+            unchanged=sum(1 for r in runs if r.outcome == "unchanged"),
+            avg_duration_ms=round(sum(durations) / len(durations), 1),
+            max_duration_ms=max(durations),
+            avg_card_count=round(sum(r.card_count or 0 for r in runs) / len(runs), 1),
+            avg_phases={k: round(v / phase_counts[k], 3) for k, v in phase_totals.items()},
+        ))
+    return out
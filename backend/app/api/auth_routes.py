@@ -6,7 +6,7 @@ from sqlalchemy import select
 from app.schemas import Token, UserOut, RegisterRequest
 from app.db import get_db
 from app.models import User
-from app.auth import hash_password, verify_password, create_access_token, get_current_user
+from app.auth import hash_password_async, verify_password_async, create_access_token, get_current_user
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -19,7 +19,7 @@ async def register(req: RegisterRequest, db: AsyncSession = Depends(get_db)):
     existing = await db.execute(select(User).where(User.email == req.email))
     if existing.scalars().first():
         raise HTTPException(status_code=400, detail="Email already registered")
-    u = User(email=req.email, password_hash=hash_password(req.password), is_admin=False)
+    u = User(email=req.email, password_hash=await hash_password_async(req.password), is_admin=False)
     db.add(u)
     await db.commit()
     await db.refresh(u)
@@ -30,7 +30,7 @@ async def register(req: RegisterRequest, db: AsyncSession = Depends(get_db)):
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     res = await db.execute(select(User).where(User.email == form_data.username))
     u = res.scalars().first()
-    if not u or not verify_password(form_data.password, u.password_hash):
+    if not u or not await verify_password_async(form_data.password, u.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     token = create_access_token(subject=u.email)
     return Token(access_token=token)
@@ -1,6 +1,13 @@
+import asyncio
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
 from app.config import settings
+from app.db import AsyncSessionLocal
 from app.locales import LOCALES
+from app.models import User
+from app.scraper import scraper_status
 
 router = APIRouter()
 
@@ -11,6 +18,40 @@ async def health():
     return {"status": "ok", "version": "1.1.0", "workers": settings.WORKER_COUNT}
 
 
+# A probe that hangs is as bad as a failed one; give up on the database after this long
+_READY_DB_TIMEOUT_SECONDS = 2.0
+
+
+async def _check_database() -> str:
+    async with AsyncSessionLocal() as db:
+        # Reads a migrated table, so a reachable but empty database is not ready either
+        await db.execute(select(User.id).limit(1))
+    return "ok"
+
+
+@router.get("/ready")
+async def ready():
+    """Readiness: 200 once the database answers and (in inline mode) a browser is installed.
+
+    /health only says the process is up; load balancers and compose healthchecks use this.
+    """
+    checks: dict[str, str] = {}
+    try:
+        checks["database"] = await asyncio.wait_for(_check_database(), timeout=_READY_DB_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        checks["database"] = "timeout"
+    except Exception as e:
+        checks["database"] = f"error: {type(e).__name__}"
+    ok = checks["database"] == "ok"
+    if str(settings.SCRAPER_MODE).lower() == "queue":
+        checks["scraper"] = "queue"  # scrapes run in app.worker, not in this process
+    else:
+        available, detail = scraper_status()
+        checks["scraper"] = detail
+        ok = ok and available
+    return JSONResponse(status_code=200 if ok else 503, content={"status": "ready" if ok else "not ready", "checks": checks})
+
+
 @router.get("/locales")
 async def list_locales():
     return sorted(list(LOCALES.keys()))
@@ -5,6 +5,7 @@ from app.schemas import DomainCreate, DomainOut
 from app.db import get_db
 from app.models import Domain, User
 from app.auth import get_current_user
+from app.service import notify_payloads_changed
 
 router = APIRouter(prefix="/domains", tags=["domains"])
 
@@ -22,6 +23,7 @@ async def create_domain(req: DomainCreate, user: User = Depends(get_current_user
     db.add(d)
     await db.commit()
     await db.refresh(d)
+    notify_payloads_changed()
     return DomainOut(id=d.id, host=d.host, active=d.active)
 
 
@@ -33,5 +35,6 @@ async def delete_domain(domain_id: int, user: User = Depends(get_current_user),
         raise HTTPException(status_code=404, detail="Domain not found")
     await db.delete(d)
     await db.commit()
+    notify_payloads_changed()
     return {"success": True}
 
@@ -8,6 +8,7 @@ from app.models import ReviewInstance, User
 from app.auth import get_current_user
 from app.locales import LOCALES
 from app.config import settings
+from app.service import notify_payloads_changed
 
 router = APIRouter(prefix="/instances", tags=["instances"])
 
@@ -54,6 +55,7 @@ async def create_instance(req: InstanceCreate, user: User = Depends(get_current_
     db.add(inst)
     await db.commit()
     await db.refresh(inst)
+    notify_payloads_changed()
     # Warm cache asynchronously so public endpoint is ready
     try:
         from app.tasks import warm_instance
@@ -97,6 +99,7 @@ async def update_instance(instance_id: int, req: InstanceUpdate, user: User = De
     db.add(inst)
     await db.commit()
     await db.refresh(inst)
+    notify_payloads_changed()
     # Warm cache after changes to reflect new settings
     try:
         from app.tasks import warm_instance
@@ -125,5 +128,6 @@ async def delete_instance(instance_id: int, user: User = Depends(get_current_use
         raise HTTPException(status_code=404, detail="Instance not found")
     await db.delete(inst)
     await db.commit()
+    notify_payloads_changed()
     return {"success": True}
 
@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from app.schemas import ReviewsResponse, StatsResponse, ReviewModeration, ReviewHideRequest, ReviewDeleteRequest
-from app.db import get_db
-from app.models import ReviewInstance, User, ReviewEntry
+from sqlalchemy import select, update, delete, exists
+from app.schemas import ReviewsResponse, StatsResponse, ReviewModeration, ReviewChangesResponse, ReviewHideRequest, ReviewDeleteRequest
+from app.db import get_db, AsyncSessionLocal
+from app.responses import FastJSONResponse, dumps, review_payloads
+from app.models import ReviewInstance, User, Review, ReviewText
 from app.auth import get_current_user
-from app.service import get_or_scrape
+from app.service import get_or_scrape, notify_payloads_changed
+from app.changes import CHANGED, REMOVED, changes_since, record_changes
+from app.search import apply_search
 from app.locales import LOCALES
 from app.config import settings
+import csv
+import io
 
 router = APIRouter(prefix="/api", tags=["api"])
 
@@ -44,7 +50,7 @@ async def api_reviews(
         if loc in LOCALES
     ]
     import asyncio
-    return await asyncio.gather(*tasks)
+    return FastJSONResponse(review_payloads(await asyncio.gather(*tasks)))
 
 
 @router.get("/stats/{instance_id}", response_model=StatsResponse)
@@ -123,9 +129,15 @@ async def list_review_items(
     include_hidden: bool = False,
     offset: int = 0,
     limit: int = 100,
+    q: str | None = None,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    """Stored reviews of one locale for moderation, oldest first.
+
+    With `q` only reviews whose text or author name contain every word (as a prefix) are
+    returned, most relevant first, from the full-text index (see app.search).
+    """
     res = await db.execute(
         select(ReviewInstance).where(
             ReviewInstance.id == instance_id,
@@ -140,25 +152,31 @@ async def list_review_items(
     loc = locale or (inst.locales[0] if (inst.locales or []) else None) or "en-US"
     import hashlib
     place_hash = hashlib.sha256(inst.place_url.encode('utf-8')).hexdigest()
-    q = select(ReviewEntry).where(ReviewEntry.place_url_hash == place_hash, ReviewEntry.locale == loc)
+    stmt = (
+        select(Review, ReviewText)
+        .join(ReviewText, ReviewText.review_pk == Review.id)
+        .where(Review.place_url_hash == place_hash, ReviewText.locale == loc)
+    )
     if not include_hidden:
-        q = q.where(ReviewEntry.hidden == False)
-    q = q.order_by(ReviewEntry.scraped_at.asc(), ReviewEntry.id.asc()).offset(max(0, int(offset))).limit(max(1, int(limit)))
-    res = await db.execute(q)
-    rows = res.scalars().all()
+        stmt = stmt.where(ReviewText.hidden == False)
+    if q and q.strip():
+        stmt = await apply_search(db, stmt, q)
+    stmt = stmt.order_by(ReviewText.scraped_at.asc(), ReviewText.id.asc()).offset(max(0, int(offset))).limit(max(1, int(limit)))
+    res = await db.execute(stmt)
+    rows = res.all()
     out: list[ReviewModeration] = []
-    for r in rows:
+    for r, t in rows:
         out.append(
             ReviewModeration(
-                locale=r.locale,
+                locale=t.locale,
                 reviewId=r.review_id,
                 name=r.name or "",
-                date=r.date or "",
+                date=t.date or "",
                 stars=float(r.stars or 0.0),
-                text=r.text or "",
+                text=t.text or "",
                 avatar=r.avatar or "",
                 profileLink=r.profile_link or "",
-                hidden=bool(r.hidden),
+                hidden=bool(t.hidden),
             )
         )
     return out
@@ -184,17 +202,17 @@ async def hide_review_item(
 
     import hashlib
     place_hash = hashlib.sha256(inst.place_url.encode('utf-8')).hexdigest()
+    core = select(Review.id).where(Review.place_url_hash == place_hash, Review.review_id == body.reviewId)
     stmt = (
-        update(ReviewEntry)
-        .where(
-            ReviewEntry.place_url_hash == place_hash,
-            ReviewEntry.locale == body.locale,
-            ReviewEntry.review_id == body.reviewId,
-        )
+        update(ReviewText)
+        .where(ReviewText.review_pk.in_(core), ReviewText.locale == body.locale)
         .values(hidden=bool(body.hidden))
     )
-    await db.execute(stmt)
+    res = await db.execute(stmt)
+    if res.rowcount:
+        await record_changes(db, place_hash, body.locale, CHANGED, [body.reviewId])
     await db.commit()
+    notify_payloads_changed()
     return {"success": True}
 
 
@@ -218,12 +236,138 @@ async def delete_review_item(
 
     import hashlib
     place_hash = hashlib.sha256(inst.place_url.encode('utf-8')).hexdigest()
-    stmt = delete(ReviewEntry).where(
-        ReviewEntry.place_url_hash == place_hash,
-        ReviewEntry.locale == body.locale,
-        ReviewEntry.review_id == body.reviewId,
+    core = select(Review.id).where(Review.place_url_hash == place_hash, Review.review_id == body.reviewId)
+    stmt = delete(ReviewText).where(ReviewText.review_pk.in_(core), ReviewText.locale == body.locale)
+    res = await db.execute(stmt)
+    if res.rowcount:
+        await record_changes(db, place_hash, body.locale, REMOVED, [body.reviewId])
+    # Drop the shared row once no locale references it anymore
+    await db.execute(
+        delete(Review).where(
+            Review.place_url_hash == place_hash,
+            Review.review_id == body.reviewId,
+            ~exists().where(ReviewText.review_pk == Review.id),
+        )
     )
-    await db.execute(stmt)
     await db.commit()
+    notify_payloads_changed()
     return {"success": True}
 
+
+@router.get("/reviews/{instance_id}/changes", response_model=ReviewChangesResponse)
+async def review_changes(
+    instance_id: int,
+    since: int = 0,
+    locale: str | None = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delta sync: reviews added, changed (hidden/unhidden) or removed after version `since`.
+
+    Pass the returned `version` as the next `since`; `since=0` (or a version that is no longer
+    available) returns the full list with `reset: true`.
+    """
+    res = await db.execute(
+        select(ReviewInstance).where(
+            ReviewInstance.id == instance_id,
+            ReviewInstance.user_id == user.id,
+            ReviewInstance.active == True,
+        )
+    )
+    inst = res.scalars().first()
+    if not inst:
+        raise HTTPException(status_code=404, detail="Instance not found")
+
+    loc = locale or (inst.locales[0] if (inst.locales or []) else None) or "en-US"
+    import hashlib
+    place_hash = hashlib.sha256(inst.place_url.encode('utf-8')).hexdigest()
+    out = await changes_since(db, place_hash, loc, max(0, int(since)))
+    return FastJSONResponse({"success": True, **out})
+
+
+_EXPORT_COLUMNS = ["locale", "reviewId", "name", "date", "stars", "text", "avatar", "profileLink", "hidden", "scrapedAt"]
+_EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+async def _export_rows(place_hash: str, locale: str | None, include_hidden: bool):
+    """Yield export rows from one server-side cursor, one partition of EXPORT_BATCH_SIZE at a time.
+
+    Uses its own session: the stream outlives the request-scoped one.
+    """
+    q = (
+        select(
+            ReviewText.locale, Review.review_id, Review.name, ReviewText.date, Review.stars,
+            ReviewText.text, Review.avatar, Review.profile_link, ReviewText.hidden, ReviewText.scraped_at,
+        )
+        .join(ReviewText, ReviewText.review_pk == Review.id)
+        .where(Review.place_url_hash == place_hash)
+    )
+    if locale:
+        q = q.where(ReviewText.locale == locale)
+    if not include_hidden:
+        q = q.where(ReviewText.hidden == False)
+    q = q.order_by(ReviewText.scraped_at.asc(), ReviewText.id.asc())
+    batch = max(1, int(settings.EXPORT_BATCH_SIZE))
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(q.execution_options(yield_per=batch))
+        async for partition in result.partitions():
+            yield [
+                [
+                    r.locale, r.review_id, r.name or "", r.date or "", float(r.stars or 0.0),
+                    r.text or "", r.avatar or "", r.profile_link or "", bool(r.hidden),
+                    r.scraped_at.isoformat() if r.scraped_at is not None else None,
+                ]
+                for r in partition
+            ]
+
+
+async def _export_ndjson(rows):
+    async for chunk in rows:
+        yield b"".join(dumps(dict(zip(_EXPORT_COLUMNS, row))) + b"\n" for row in chunk)
+
+
+async def _export_csv(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(_EXPORT_COLUMNS)
+    async for chunk in rows:
+        writer.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+@router.get("/reviews/{instance_id}/export")
+async def export_review_items(
+    instance_id: int,
+    format: str = "ndjson",
+    locale: str | None = None,
+    include_hidden: bool = True,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream all stored reviews of an instance as NDJSON (default) or CSV."""
+    if format not in _EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be one of: ndjson, csv")
+    res = await db.execute(
+        select(ReviewInstance).where(
+            ReviewInstance.id == instance_id,
+            ReviewInstance.user_id == user.id,
+            ReviewInstance.active == True,
+        )
+    )
+    inst = res.scalars().first()
+    if not inst:
+        raise HTTPException(status_code=404, detail="Instance not found")
+
+    import hashlib
+    place_hash = hashlib.sha256(inst.place_url.encode('utf-8')).hexdigest()
+    rows = _export_rows(place_hash, locale, include_hidden)
+    body = _export_csv(rows) if format == "csv" else _export_ndjson(rows)
+    return StreamingResponse(
+        body,
+        media_type=_EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="reviews-{instance_id}.{format}"'},
+    )
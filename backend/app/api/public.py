@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import asyncio
 
-from app.schemas import ReviewsResponse
+from app.schemas import BatchReviewsResponse, ReviewsResponse
+from app.responses import negotiated_json_response, negotiated_response, review_payloads
+from app.render import DESIGNS, THEMES, render_fragment
 from app.db import get_db
 from app.models import ReviewInstance, Domain
-from app.service import get_or_scrape
+from app.service import get_or_scrape, get_payloads_bulk
 from app.locales import LOCALES
 from app.config import settings
 
 router = APIRouter(prefix="/public", tags=["public"])
-logger = logging.getLogger("reviewsflow")
+logger = logging.getLogger("reviewsflow.public")
 
 
 def _origin_host(request: Request) -> str | None:
@@ -30,8 +33,73 @@ def _origin_host(request: Request) -> str | None:
         return None
 
 
-@router.get("/reviews/{public_key}", response_model=list[ReviewsResponse])
-async def public_reviews(public_key: str, request: Request, db: AsyncSession = Depends(get_db)):
+def _origin_allowed(host: str | None, domains) -> bool:
+    """An empty allowlist allows everyone; otherwise the origin host must match an entry."""
+    if not domains:
+        return True
+    allowed = {d.host.lower() for d in domains}
+    return bool(host) and any((h in host or host in h) for h in allowed)
+
+
+@router.get("/reviews", response_model=BatchReviewsResponse)
+async def public_reviews_batch(
+    request: Request,
+    keys: list[str] = Query(..., description="Public keys, repeated (?keys=a&keys=b) or comma-separated"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Several widget instances in one round trip, keyed by public key.
+
+    Instances, allowlists, TTL markers and stored reviews are each loaded with one query for all
+    keys; keys that are unknown or not allowed for this origin are reported under `errors`.
+    """
+    wanted_keys = list(dict.fromkeys(k.strip() for raw in keys for k in raw.split(",") if k.strip()))
+    if not wanted_keys:
+        raise HTTPException(status_code=400, detail="No public keys given")
+    if len(wanted_keys) > int(settings.PUBLIC_BATCH_MAX_KEYS):
+        raise HTTPException(status_code=400, detail=f"At most {settings.PUBLIC_BATCH_MAX_KEYS} keys per request")
+
+    res = await db.execute(
+        select(ReviewInstance).where(ReviewInstance.public_key.in_(wanted_keys), ReviewInstance.active == True)
+    )
+    instances = {i.public_key: i for i in res.scalars().all()}
+    domains_by_user: dict[int, list[Domain]] = {}
+    if instances:
+        res = await db.execute(
+            select(Domain).where(Domain.user_id.in_({i.user_id for i in instances.values()}), Domain.active == True)
+        )
+        for d in res.scalars().all():
+            domains_by_user.setdefault(d.user_id, []).append(d)
+
+    host = _origin_host(request)
+    errors: dict[str, dict] = {}
+    wanted: list[tuple] = []
+    owners: list[str] = []
+    for key in wanted_keys:
+        inst = instances.get(key)
+        if inst is None:
+            errors[key] = {"status": 404, "detail": "Instance not found"}
+            continue
+        if not _origin_allowed(host, domains_by_user.get(inst.user_id)):
+            errors[key] = {"status": 403, "detail": "Origin not allowed"}
+            continue
+        for loc in inst.locales or settings.DEFAULT_LOCALES or ["en-US"]:
+            if loc in LOCALES:
+                wanted.append((inst.place_url, loc, inst.min_rating, max(inst.max_reviews or 0, 100), inst.sort))
+                owners.append(key)
+
+    payloads = await get_payloads_bulk(db, wanted)
+    results: dict[str, list[dict]] = {key: [] for key in wanted_keys if key not in errors}
+    for key, payload in zip(owners, payloads):
+        results[key].append(payload)
+    logger.debug("Public batch keys=%d served=%d errors=%d", len(wanted_keys), len(results), len(errors))
+    return await negotiated_json_response(request, {
+        "success": True,
+        "results": {key: review_payloads(p) for key, p in results.items()},
+        "errors": errors,
+    })
+
+
+async def _resolve_instance(db: AsyncSession, public_key: str, request: Request) -> ReviewInstance:
     res = await db.execute(select(ReviewInstance).where(ReviewInstance.public_key == public_key, ReviewInstance.active == True))
     inst = res.scalars().first()
     if not inst:
@@ -40,15 +108,55 @@ async def public_reviews(public_key: str, request: Request, db: AsyncSession = D
     # Enforce domain allowlist if present
     res = await db.execute(select(Domain).where(Domain.user_id == inst.user_id, Domain.active == True))
     domains = res.scalars().all()
-    if domains:
-        host = _origin_host(request)
-        allowed = {d.host.lower() for d in domains}
-        if not host or all((h not in host and host not in h) for h in allowed):
-            raise HTTPException(status_code=403, detail="Origin not allowed")
+    if not _origin_allowed(_origin_host(request), domains):
+        raise HTTPException(status_code=403, detail="Origin not allowed")
+    return inst
+
+
+@router.get("/reviews/{public_key}/html", response_class=HTMLResponse)
+async def public_reviews_html(
+    public_key: str,
+    request: Request,
+    locale: str | None = None,
+    min_rating: float | None = None,
+    max_reviews: int | None = None,
+    theme: str = "dark",
+    design: str = "grid",
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-rendered widget markup (one locale) for inlining without client-side rendering.
+
+    `min_rating` can only tighten the instance setting and `max_reviews` is capped like the JSON
+    endpoint. The fragment is re-rendered only when its payload changes and carries an ETag.
+    """
+    if theme not in THEMES or design not in DESIGNS:
+        raise HTTPException(status_code=400, detail=f"theme must be one of {THEMES}, design one of {DESIGNS}")
+    inst = await _resolve_instance(db, public_key, request)
+    locales = [loc for loc in (inst.locales or settings.DEFAULT_LOCALES or ["en-US"]) if loc in LOCALES]
+    loc = locale if locale in locales else (locales[0] if locales else "en-US")
+    cap = max(inst.max_reviews or 0, 100)
+    limit = cap if not max_reviews or max_reviews <= 0 else min(int(max_reviews), cap)
+    floor = float(inst.min_rating or 0.0)
+    payload = await get_or_scrape(
+        db,
+        inst.place_url,
+        loc,
+        False,
+        max(floor, float(min_rating)) if min_rating is not None else floor,
+        limit,
+        inst.sort,
+    )
+    etag, body = render_fragment(review_payloads([payload])[0], theme, design)
+    return await negotiated_response(request, body, "text/html; charset=utf-8", etag=etag)
+
+
+@router.get("/reviews/{public_key}", response_model=list[ReviewsResponse])
+async def public_reviews(public_key: str, request: Request, db: AsyncSession = Depends(get_db)):
+    inst = await _resolve_instance(db, public_key, request)
 
     locales = inst.locales or settings.DEFAULT_LOCALES or ["en-US"]
-    logger.info(
-        "[PUBLIC] reviews key=%s place=%s locales=%s min=%s max=%s sort=%s",
+    logger.debug(
+        "Public reviews key=%s place=%s locales=%s min=%s max=%s sort=%s",
         public_key,
         inst.place_url,
         locales,
@@ -69,20 +177,12 @@ async def public_reviews(public_key: str, request: Request, db: AsyncSession = D
         for loc in locales if loc in LOCALES
     ]
     result = await asyncio.gather(*tasks)
-    try:
-        # Log brief cache info from payloads
-        infos = []
-        for r in result:
-            if isinstance(r, dict):
-                p = r.get("params", {}) if isinstance(r.get("params"), dict) else {}
-                infos.append({
-                    "loc": r.get("locale"),
-                    "count": r.get("count"),
-                    "avg": r.get("averageRating"),
-                    "params": p,
-                })
-        logger.info("[PUBLIC] result key=%s info=%s", public_key, infos)
-    except Exception:
-        pass
-    return result
+    if logger.isEnabledFor(logging.DEBUG):
+        infos = [
+            {"loc": r.get("locale"), "count": r.get("count"), "avg": r.get("averageRating"), "params": r.get("params")}
+            for r in result
+            if isinstance(r, dict)
+        ]
+        logger.debug("Public result key=%s info=%s", public_key, infos)
+    return await negotiated_json_response(request, review_payloads(result))
 
@@ -1,6 +1,10 @@
+import asyncio
 import hashlib
 import base64
+import os
+import time
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -17,6 +21,15 @@ from app.models import User
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# In-process caches for the authenticated hot path. No endpoint changes or deletes users, so
+# entries are never invalidated; changes made elsewhere (`python -m app.migrate`, direct SQL)
+# apply once entries expire after AUTH_CACHE_TTL_SECONDS. Any future user-mutating endpoint
+# must drop that user's _USER_CACHE entry and its _TOKEN_CACHE entries.
+# token digest -> (subject, token expiry as unix timestamp)
+_TOKEN_CACHE: dict[str, tuple[str, float]] = {}
+# subject (email) -> (detached User, cache entry expiry as unix timestamp)
+_USER_CACHE: dict[str, tuple[User, float]] = {}
+
 def hash_password(password: str) -> str:
     """
     Hashes a password using bcrypt. 
@@ -31,7 +44,7 @@ def hash_password(password: str) -> str:
     
     # 3. Bcrypt Hash
     # bcrypt.hashpw returns bytes, so we decode to utf-8 for storage
-    return bcrypt.hashpw(b64_hash, bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(b64_hash, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode('utf-8')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -53,12 +66,90 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+# Dedicated pool for bcrypt work. bcrypt releases the GIL, so threads scale with cores
+# while keeping hashing off the event loop.
+_HASH_POOL: Optional[ThreadPoolExecutor] = None
+_HASH_PENDING = 0
+
+
+def _hash_pool() -> ThreadPoolExecutor:
+    global _HASH_POOL
+    if _HASH_POOL is None:
+        workers = settings.PASSWORD_HASH_WORKERS or (os.cpu_count() or 1)
+        _HASH_POOL = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="bcrypt")
+    return _HASH_POOL
+
+
+async def _run_hashing(fn, *args):
+    """Run a hashing call in the bcrypt pool, rejecting work beyond the queue limit."""
+    global _HASH_PENDING
+    if _HASH_PENDING >= max(1, int(settings.PASSWORD_HASH_QUEUE_LIMIT)):
+        raise HTTPException(status_code=503, detail="Too many authentication requests, try again shortly")
+    _HASH_PENDING += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool(), fn, *args)
+    finally:
+        _HASH_PENDING -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes or settings.JWT_EXPIRE_MINUTES)
     payload = {"sub": subject, "exp": expire}
     return jwt.encode(payload, settings.JWT_SECRET, algorithm="HS256")
 
 
+def _cache_ttl() -> int:
+    try:
+        return max(0, int(settings.AUTH_CACHE_TTL_SECONDS))
+    except Exception:
+        return 0
+
+
+def _cache_put(cache: dict, key: str, value: tuple) -> None:
+    # Drop expired entries first, then the oldest ones, to keep the cache bounded
+    limit = max(1, int(settings.AUTH_CACHE_MAX_ENTRIES))
+    if len(cache) >= limit:
+        now = time.time()
+        for k in [k for k, v in cache.items() if v[1] <= now]:
+            cache.pop(k, None)
+        while len(cache) >= limit:
+            cache.pop(next(iter(cache)), None)
+    cache[key] = value
+
+
+def _decode_token(token: str) -> tuple[str, float]:
+    """Return (subject, expiry) for a valid token, reusing earlier verifications."""
+    now = time.time()
+    ttl = _cache_ttl()
+    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    if ttl:
+        hit = _TOKEN_CACHE.get(digest)
+        if hit is not None:
+            if hit[1] > now:
+                return hit
+            _TOKEN_CACHE.pop(digest, None)
+
+    payload = jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
+    sub = payload.get("sub")
+    if sub is None:
+        raise JWTError("Token has no subject")
+    try:
+        exp = float(payload.get("exp"))
+    except Exception:
+        exp = now + ttl
+    if ttl:
+        _cache_put(_TOKEN_CACHE, digest, (str(sub), exp))
+    return str(sub), exp
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,17 +157,27 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
-        sub: str = payload.get("sub")
-        if sub is None:
-            raise credentials_exception
+        sub, token_exp = _decode_token(token)
     except JWTError:
         raise credentials_exception
-        
+
+    now = time.time()
+    ttl = _cache_ttl()
+    if ttl:
+        hit = _USER_CACHE.get(sub)
+        if hit is not None:
+            if hit[1] > now:
+                return hit[0]
+            _USER_CACHE.pop(sub, None)
+
     res = await db.execute(select(User).where(User.email == sub))
     user = res.scalars().first()
     if not user:
         raise credentials_exception
+    if ttl:
+        # Detach so the cached instance is not tied to this request's session
+        db.expunge(user)
+        _cache_put(_USER_CACHE, sub, (user, min(now + ttl, token_exp)))
     return user
 
 
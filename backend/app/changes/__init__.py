@@ -0,0 +1,121 @@
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Review, ReviewText, ReviewVersion, ReviewChange
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+
+async def bump_version(db: AsyncSession, place_hash: str, locale: str) -> int:
+    """Increment the change version of (place, locale) inside the caller's transaction.
+
+    The UPDATE holds the row lock until the caller commits, so versions of one key are
+    committed in the order they were handed out.
+    """
+    key = (ReviewVersion.place_url_hash == place_hash, ReviewVersion.locale == locale)
+    res = await db.execute(update(ReviewVersion).where(*key).values(version=ReviewVersion.version + 1))
+    if not res.rowcount:
+        try:
+            async with db.begin_nested():
+                db.add(ReviewVersion(place_url_hash=place_hash, locale=locale, version=1, floor=0))
+        except IntegrityError:
+            # Created by a concurrent transaction in the meantime
+            await db.execute(update(ReviewVersion).where(*key).values(version=ReviewVersion.version + 1))
+    return int((await db.execute(select(ReviewVersion.version).where(*key))).scalar_one())
+
+
+async def record_changes(db: AsyncSession, place_hash: str, locale: str, kind: str, review_ids: list[str]) -> int | None:
+    """Log `kind` for `review_ids` under a new version (not committed); returns that version."""
+    if not review_ids:
+        return None
+    version = await bump_version(db, place_hash, locale)
+    await db.execute(insert(ReviewChange), [
+        {"place_url_hash": place_hash, "locale": locale, "version": version, "review_id": rid, "kind": kind}
+        for rid in dict.fromkeys(review_ids)
+    ])
+    return version
+
+
+async def reset_versions(db: AsyncSession, place_hash: str | None = None, locales: list[str] | None = None) -> None:
+    """Start a new version for matching keys and make it the floor, forcing clients to resync.
+
+    Used after bulk deletes that are not logged row by row; log rows at or below the floor
+    are no longer read and can be deleted (see app.cleanup).
+    """
+    conds = []
+    if place_hash:
+        conds.append(ReviewVersion.place_url_hash == place_hash)
+    if locales:
+        conds.append(ReviewVersion.locale.in_(locales))
+    # Two statements: MySQL evaluates SET left to right with the updated value, others with the old one
+    await db.execute(update(ReviewVersion).where(*conds).values(version=ReviewVersion.version + 1))
+    await db.execute(update(ReviewVersion).where(*conds).values(floor=ReviewVersion.version))
+
+
+def _item(r: Review, t: ReviewText) -> dict:
+    return {
+        "locale": t.locale,
+        "reviewId": r.review_id,
+        "name": r.name or "",
+        "date": t.date or "",
+        "stars": float(r.stars or 0.0),
+        "text": t.text or "",
+        "avatar": r.avatar or "",
+        "profileLink": r.profile_link or "",
+        "hidden": bool(t.hidden),
+    }
+
+
+async def changes_since(db: AsyncSession, place_hash: str, locale: str, since: int) -> dict:
+    """Reviews of (place, locale) added, changed or removed after version `since`.
+
+    `since=0`, a version older than the floor or one the server never issued returns every
+    current review under `added` with `reset: true`; the client should replace its copy.
+    Hidden reviews are included with `hidden: true`.
+    """
+    row = (await db.execute(
+        select(ReviewVersion.version, ReviewVersion.floor)
+        .where(ReviewVersion.place_url_hash == place_hash, ReviewVersion.locale == locale)
+    )).first()
+    version, floor = (int(row.version), int(row.floor)) if row else (0, 0)
+    out = {"locale": locale, "since": since, "version": version, "reset": False, "added": [], "changed": [], "removed": []}
+
+    base = (
+        select(Review, ReviewText)
+        .join(ReviewText, ReviewText.review_pk == Review.id)
+        .where(Review.place_url_hash == place_hash, ReviewText.locale == locale)
+    )
+    if since <= 0 or since < floor or since > version:
+        res = await db.execute(base.order_by(ReviewText.scraped_at.asc(), ReviewText.id.asc()))
+        out["reset"] = True
+        out["added"] = [_item(r, t) for r, t in res.all()]
+        return out
+    if since == version:
+        return out
+
+    res = await db.execute(
+        select(ReviewChange.review_id, ReviewChange.kind)
+        .where(
+            ReviewChange.place_url_hash == place_hash,
+            ReviewChange.locale == locale,
+            ReviewChange.version > since,
+        )
+        .order_by(ReviewChange.version.asc(), ReviewChange.id.asc())
+    )
+    # The first change in the range tells whether the client can already know the review
+    first_kind: dict[str, str] = {}
+    for rid, kind in res.all():
+        first_kind.setdefault(rid, kind)
+    if not first_kind:
+        return out
+    res = await db.execute(base.where(Review.review_id.in_(first_kind)).order_by(ReviewText.scraped_at.asc(), ReviewText.id.asc()))
+    present = set()
+    for r, t in res.all():
+        present.add(r.review_id)
+        out[ADDED if first_kind[r.review_id] == ADDED else CHANGED].append(_item(r, t))
+    # Reviews added and removed within the range were never seen by the client
+    out[REMOVED] = [rid for rid, kind in first_kind.items() if rid not in present and kind != ADDED]
+    return out
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, delete, update, exists
+
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.changes import reset_versions
+from app.models import CleanupJob, Review, ReviewText, ReviewCache, ReviewChange, ReviewVersion
+
+logger = logging.getLogger("reviewsflow.cleanup")
+
+# Jobs without a progress write for this long belong to a process that went away
+STALE_AFTER = timedelta(minutes=5)
+
+# Strong references so running jobs are not garbage collected mid-flight
+_RUNNING: set[asyncio.Task] = set()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def start_cleanup(job_id: int) -> None:
+    """Run a queued cleanup job in the background of this process."""
+    task = asyncio.create_task(run_cleanup_job(job_id))
+    _RUNNING.add(task)
+    task.add_done_callback(_RUNNING.discard)
+
+
+async def _delete_in_batches(job_id: int, model, id_query, counter: str | None) -> None:
+    """Delete rows selected by `id_query` in primary-key order, one short transaction per batch.
+
+    Progress (and the cancel flag) is read and written in the same transaction as the delete.
+    """
+    batch = max(1, int(settings.CLEANUP_BATCH_SIZE))
+    pause = max(0, int(settings.CLEANUP_PAUSE_MS)) / 1000.0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            ids = (await db.execute(
+                id_query.where(model.id > last_id).order_by(model.id.asc()).limit(batch)
+            )).scalars().all()
+            if not ids:
+                return
+            last_id = ids[-1]
+            res = await db.execute(delete(model).where(model.id.in_(ids)))
+            values = {"batches": CleanupJob.batches + 1, "updated_at": datetime.now(timezone.utc)}
+            if counter:
+                values[counter] = getattr(CleanupJob, counter) + (res.rowcount or 0)
+            await db.execute(update(CleanupJob).where(CleanupJob.id == job_id).values(**values))
+            cancel = (await db.execute(
+                select(CleanupJob.cancel_requested).where(CleanupJob.id == job_id)
+            )).scalar()
+            await db.commit()
+        if cancel:
+            raise _Cancelled()
+        if pause:
+            await asyncio.sleep(pause)
+
+
+async def run_cleanup_job(job_id: int) -> None:
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        job = await db.get(CleanupJob, job_id)
+        if job is None or job.status != "pending":
+            return
+        params = dict(job.params or {})
+        job.status = "running"
+        job.started_at = now
+        job.updated_at = now
+        await db.commit()
+    logger.info("Cleanup job %s started params=%s", job_id, params)
+
+    place_url = params.get("place_url")
+    locales = params.get("locales")
+    cutoff = None
+    if params.get("older_than_days") is not None:
+        try:
+            cutoff = now - timedelta(days=int(params["older_than_days"]))
+        except Exception:
+            cutoff = None
+
+    status = "done"
+    error = None
+    try:
+        if params.get("delete_reviews", True):
+            place_hash = hashlib.sha256(str(place_url).encode("utf-8")).hexdigest() if place_url else None
+            q = select(ReviewText.id)
+            if place_hash:
+                q = q.where(ReviewText.review_pk.in_(select(Review.id).where(Review.place_url_hash == place_hash)))
+            if locales:
+                q = q.where(ReviewText.locale.in_(locales))
+            if cutoff is not None:
+                q = q.where(ReviewText.scraped_at < cutoff)
+            await _delete_in_batches(job_id, ReviewText, q, "deleted_reviews")
+            # Shared rows without any remaining locale text
+            q = select(Review.id).where(~exists().where(ReviewText.review_pk == Review.id))
+            if place_hash:
+                q = q.where(Review.place_url_hash == place_hash)
+            await _delete_in_batches(job_id, Review, q, None)
+            # Bulk deletes are not logged per review: delta-sync clients of these keys must resync,
+            # which also makes their change log obsolete
+            async with AsyncSessionLocal() as db:
+                await reset_versions(db, place_hash, locales)
+                await db.commit()
+            floor = (
+                select(ReviewVersion.floor)
+                .where(ReviewVersion.place_url_hash == ReviewChange.place_url_hash, ReviewVersion.locale == ReviewChange.locale)
+                .scalar_subquery()
+            )
+            q = select(ReviewChange.id).where(ReviewChange.version <= floor)
+            if place_hash:
+                q = q.where(ReviewChange.place_url_hash == place_hash)
+            if locales:
+                q = q.where(ReviewChange.locale.in_(locales))
+            await _delete_in_batches(job_id, ReviewChange, q, None)
+        if params.get("delete_cache", True):
+            q = select(ReviewCache.id)
+            if place_url:
+                q = q.where(ReviewCache.place_url == str(place_url))
+            if locales:
+                q = q.where(ReviewCache.locale.in_(locales))
+            await _delete_in_batches(job_id, ReviewCache, q, "deleted_cache")
+    except _Cancelled:
+        status = "cancelled"
+    except Exception as e:
+        status = "failed"
+        error = str(e)
+        logger.warning("Cleanup job %s failed", job_id, exc_info=True)
+
+    finished = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(CleanupJob)
+            .where(CleanupJob.id == job_id)
+            .values(status=status, error=error, finished_at=finished, updated_at=finished)
+        )
+        await db.commit()
+    logger.info("Cleanup job %s %s", job_id, status)
+
+
+async def fail_stale_cleanup_jobs() -> int:
+    """Mark jobs left pending/running by a stopped process as failed (called at startup)."""
+    cutoff = datetime.now(timezone.utc) - STALE_AFTER
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(
+            update(CleanupJob)
+            .where(
+                CleanupJob.status.in_(("pending", "running")),
+                # updated_at is NULL until the job starts
+                ((CleanupJob.updated_at == None) & (CleanupJob.created_at < cutoff))  # noqa: E711
+                | (CleanupJob.updated_at < cutoff),
+            )
+            .values(status="failed", error="interrupted", finished_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        return res.rowcount or 0
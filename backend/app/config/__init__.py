@@ -27,12 +27,57 @@ class Settings(BaseSettings):
     DEFAULT_LOCALES: Optional[List[str]] = None
     CONFIG_FILE: Optional[str] = None
     MAX_PLAYWRIGHT_INSTANCES: int = 2
+    SCRAPER_STATE_DIR: Optional[str] = "./.scraper_state"  # per-locale consent storage state; None disables
+    SCRAPER_STATE_TTL_HOURS: int = 168
+    # Scroll loop: wait in-page for new cards, backing off from MIN to MAX while nothing loads
+    SCRAPER_SCROLL_WAIT_MIN_MS: int = 250
+    SCRAPER_SCROLL_WAIT_MAX_MS: int = 4000
+    SCRAPER_STALL_SECONDS: float = 6.0           # stop after this long without new cards
+    SCRAPER_PARALLEL_LOCALES: int = 3            # pages per browser on multi-locale refreshes; 1 = one browser per locale
+    # Probe (review total + newest id) before scrolling; unchanged places skip the full scrape
+    SCRAPER_PROBE: bool = True
+    PROBE_MAX_SKIP_HOURS: int = 24               # run a full scrape at least this often anyway
+    # Retries after "reviews panel not found" failures, one pending retry per (place, locale)
+    RETRY_MAX_ATTEMPTS: int = 5
+    RETRY_BASE_SECONDS: int = 300                # first delay, doubled per attempt (with jitter)...
+    RETRY_MAX_SECONDS: int = 3600                # ...up to this
+    # Per-(place, locale) circuit breaker: after N consecutive scrape failures stop scraping it for a while
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_COOLDOWN_MINUTES: int = 30
+    # "inline": scrape inside the API process; "queue": enqueue scrape_jobs for `python -m app.worker`
+    SCRAPER_MODE: str = "inline"
+    WORKER_CONCURRENCY: Optional[int] = None     # defaults to MAX_PLAYWRIGHT_INSTANCES
+    WORKER_POLL_SECONDS: float = 2.0
+    SCRAPE_JOB_TIMEOUT_MINUTES: int = 30         # running jobs older than this are requeued
     # Auth and multi-tenant
     ALLOW_REGISTRATIONS: bool = True
     ADMIN_EMAIL: Optional[str] = None
     ADMIN_PASSWORD: Optional[str] = None
     JWT_SECRET: str = "devsecret-change-me"
     JWT_EXPIRE_MINUTES: int = 60 * 24
+    AUTH_CACHE_TTL_SECONDS: int = 60     # 0 disables the authenticated-user cache
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # defaults to CPU count
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64          # pending hash/verify calls before returning 503
+    # Precompressed public payloads
+    GZIP_LEVEL: int = 9
+    BROTLI_QUALITY: int = 9
+    COMPRESSED_PAYLOAD_CACHE_SIZE: int = 512     # distinct payload bodies kept with their variants
+    FRAGMENT_CACHE_SIZE: int = 256               # rendered HTML fragments kept (per payload/theme/design)
+    PUBLIC_BATCH_MAX_KEYS: int = 20              # public keys per GET /public/reviews?keys=...
+    # Static widget snapshots for nginx (frontend/nginx.conf); None disables the publisher
+    SNAPSHOT_DIR: Optional[str] = None
+    SNAPSHOT_INTERVAL_SECONDS: int = 60          # full resync period; review changes publish sooner
+    # Review exports
+    EXPORT_BATCH_SIZE: int = 1000                # rows per server-side cursor fetch
+    # /admin/cleanup runs in the background, one short DELETE transaction per batch
+    CLEANUP_BATCH_SIZE: int = 1000
+    CLEANUP_PAUSE_MS: int = 200                  # sleep between batches so ingest/reads get the locks
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"                     # "text" | "json"
+    LOG_LEVELS: Optional[Dict[str, str]] = None  # per-logger overrides, e.g. {"reviewsflow.scraper": "DEBUG"}
 
 
 def _load_yaml_file() -> Dict[str, Any]:
@@ -3,7 +3,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi import HTTPException
-from sqlalchemy import select, update
 from datetime import datetime, timezone
 import asyncio
 import sys
@@ -11,10 +10,8 @@ import logging
 import traceback
 import uuid
 
-from app.db import engine, Base, AsyncSessionLocal
-from app.models import ReviewCache, User
+from app.db import engine
 from app.config import settings
-from app.auth import hash_password
 from app.api import core as api_core
 from app.api import auth_routes as api_auth
 from app.api import public as api_public
@@ -24,7 +21,12 @@ from app.api import instances as api_instances
 from app.api import stats as api_stats
 from app.api import private as api_private
 from app.api import admin as api_admin
+from app.api import metrics as api_metrics
+from app.metrics import instrument_engine
 from app.tasks import monitor_loop
+from app.publish import snapshot_loop
+from app.log import setup_logging, request_id_var
+from app.cleanup import fail_stale_cleanup_jobs
 
 
 if sys.platform == "win32":
@@ -46,15 +48,19 @@ app.add_middleware(
 )
 
 
-# Configure basic logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+# Queue-based logging; records are formatted and written on a background thread
+setup_logging()
 logger = logging.getLogger("reviewsflow")
 
+# SQL statement latency for /metrics
+instrument_engine(engine)
+
 
 @app.middleware("http")
 async def add_request_id_and_handle_errors(request: Request, call_next):
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
+    request_id_token = request_id_var.set(request_id)
     try:
         response = await call_next(request)
     except HTTPException as he:
@@ -76,14 +82,14 @@ async def add_request_id_and_handle_errors(request: Request, call_next):
             ScrapeError = None  # type: ignore
 
         if ScrapeError is not None and isinstance(ex, ScrapeError):
-            # If it's the specific panel-not-found case, schedule a retry in 5 minutes
+            # If it's the specific panel-not-found case, schedule a (deduplicated, backed-off) retry
             try:
                 if isinstance(ex.message, str) and ex.message.startswith("Could not locate reviews panel"):
                     from app.tasks import schedule_rescrape
                     place = getattr(ex, "place_url", None)
                     loc = getattr(ex, "locale", None)
                     if place and loc:
-                        schedule_rescrape(str(place), [str(loc)], delay_seconds=300)
+                        schedule_rescrape(str(place), [str(loc)])
             except Exception:
                 pass
             payload = {
@@ -110,6 +116,8 @@ async def add_request_id_and_handle_errors(request: Request, call_next):
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
         return JSONResponse(status_code=500, content=payload)
+    finally:
+        request_id_var.reset(request_id_token)
 
     # Attach request id header for success responses too
     try:
@@ -137,33 +145,19 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 @app.on_event("startup")
 async def startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    # background monitor loop
+    # Schema, data migrations, backfills and the admin bootstrap run in `python -m app.migrate`;
+    # startup only launches background loops so the process is up immediately (see /ready)
     asyncio.create_task(monitor_loop())
-    # Backfill cache timestamps if missing (prevents unnecessary refresh)
+    if settings.SNAPSHOT_DIR:
+        asyncio.create_task(snapshot_loop())
+    asyncio.create_task(_fail_stale_cleanup_jobs())
+
+
+async def _fail_stale_cleanup_jobs() -> None:
     try:
-        async with AsyncSessionLocal() as db:
-            await db.execute(
-                update(ReviewCache)
-                .where(ReviewCache.updated_at == None)  # noqa: E711
-                .values(updated_at=datetime.now(timezone.utc))
-            )
-            await db.commit()
+        await fail_stale_cleanup_jobs()
     except Exception:
         pass
-    # Bootstrap admin if registrations are disabled and no users exist
-    async with AsyncSessionLocal() as db:
-        res = await db.execute(select(User))
-        any_user = res.scalars().first()
-        if not any_user and not settings.ALLOW_REGISTRATIONS:
-            if settings.ADMIN_EMAIL and settings.ADMIN_PASSWORD:
-                u = User(email=settings.ADMIN_EMAIL, password_hash=hash_password(settings.ADMIN_PASSWORD), is_admin=True)
-                db.add(u)
-                await db.commit()
-            else:
-                # No users and registrations disabled; provide warning only
-                pass
 
 
 # Include routers
@@ -176,4 +170,5 @@ app.include_router(api_instances.router)
 app.include_router(api_stats.router)
 app.include_router(api_private.router)
 app.include_router(api_admin.router)
+app.include_router(api_metrics.router)
 
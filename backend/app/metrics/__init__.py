@@ -0,0 +1,94 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+
+# Scraping
+SCRAPE_DURATION = Histogram(
+    "reviewsflow_scrape_duration_seconds",
+    "Wall time of a single place/locale scrape",
+    ["locale", "outcome"],
+    buckets=(1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600),
+)
+SCRAPES = Counter("reviewsflow_scrapes_total", "Scrapes by locale and outcome", ["locale", "outcome"])
+SCRAPES_INFLIGHT = Gauge("reviewsflow_scrapes_inflight", "Scrapes currently holding a browser slot")
+REVIEWS_INSERTED = Histogram(
+    "reviewsflow_reviews_inserted_per_scrape",
+    "New reviews stored per successful scrape",
+    ["locale"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+
+# Concurrency control
+SCRAPE_SEM_WAIT = Histogram(
+    "reviewsflow_scrape_semaphore_wait_seconds",
+    "Time spent waiting for a browser slot (MAX_PLAYWRIGHT_INSTANCES)",
+    buckets=(0.001, 0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300),
+)
+SCRAPE_LOCK_WAIT = Histogram(
+    "reviewsflow_scrape_lock_wait_seconds",
+    "Time spent waiting on the per-(place, locale) scrape lock",
+    buckets=(0.001, 0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300),
+)
+COALESCED_REQUESTS = Counter(
+    "reviewsflow_coalesced_requests_total",
+    "get_or_scrape calls that joined an identical in-flight call instead of doing the work",
+)
+SCRAPE_LOCKS_TRACKED = Gauge(
+    "reviewsflow_scrape_locks_tracked",
+    "Per-(place, locale) scrape locks currently held or waited on",
+)
+
+# Cache
+CACHE_LOOKUPS = Counter(
+    "reviewsflow_cache_lookups_total",
+    "TTL checks in get_or_scrape (hit = fresh, miss = no entry, stale = expired, forced = refresh requested)",
+    ["result"],
+)
+
+# Database
+DB_QUERY_DURATION = Histogram(
+    "reviewsflow_db_query_duration_seconds",
+    "Latency of individual SQL statements",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+# Background monitor
+MONITOR_TICK_DURATION = Histogram(
+    "reviewsflow_monitor_tick_duration_seconds",
+    "Duration of one monitor_loop pass",
+    buckets=(0.01, 0.1, 1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+MONITOR_DUE_LAG = Histogram(
+    "reviewsflow_monitor_due_lag_seconds",
+    "How late a due monitor/instance was picked up relative to its interval",
+    ["kind"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200),
+)
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    return head[0].upper() if head else "OTHER"
+
+
+def instrument_engine(engine) -> None:
+    """Record per-statement latency for an (async) SQLAlchemy engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if starts:
+            DB_QUERY_DURATION.labels(_operation(statement)).observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
@@ -0,0 +1,177 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import MetaData, Table, inspect, insert, select, text, update
+
+from app.config import settings
+from app.db import AsyncSessionLocal, Base, engine
+from app.models import Review, ReviewCache, ReviewText, User
+from app.search import ensure_search_index
+
+logger = logging.getLogger("reviewsflow.migrate")
+
+# Columns added to existing tables after their first release; create_all only creates tables
+_ADDED_COLUMNS = (
+    ("scrape_jobs", "probe", "BOOLEAN NOT NULL DEFAULT FALSE"),
+)
+
+LEGACY_REVIEWS_TABLE = "reviews"
+LEGACY_REVIEWS_RENAMED = "reviews_legacy"
+_BATCH = 2000
+
+
+def migrate_legacy_reviews(conn) -> int:
+    """Copy rows of the old per-locale `reviews` table into review_core/review_texts.
+
+    Runs on a sync connection (`await conn.run_sync(migrate_legacy_reviews)`). Idempotent:
+    rows already present are skipped, and the old table is renamed to `reviews_legacy`
+    afterwards so the next start has nothing to do. Returns the number of text rows copied.
+    """
+    insp = inspect(conn)
+    if not insp.has_table(LEGACY_REVIEWS_TABLE):
+        return 0
+    columns = {c["name"] for c in insp.get_columns(LEGACY_REVIEWS_TABLE)}
+    if not {"locale", "review_id", "place_url"} <= columns:
+        return 0
+    legacy = Table(LEGACY_REVIEWS_TABLE, MetaData(), autoload_with=conn)
+    core = Review.__table__
+    texts = ReviewText.__table__
+
+    core_ids: dict[tuple[str, str], int] = {
+        (h, rid): pk for h, rid, pk in conn.execute(select(core.c.place_url_hash, core.c.review_id, core.c.id))
+    }
+    text_keys: set[tuple[int, str]] = set(conn.execute(select(texts.c.review_pk, texts.c.locale)).all())
+
+    copied = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(legacy).where(legacy.c.id > last_id).order_by(legacy.c.id).limit(_BATCH)
+        ).mappings().all()
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+
+        def _key(row) -> tuple[str, str]:
+            place_hash = row["place_url_hash"] or hashlib.sha256((row["place_url"] or "").encode("utf-8")).hexdigest()
+            return place_hash, str(row["review_id"])
+
+        new_core: dict[tuple[str, str], dict] = {}
+        for row in rows:
+            key = _key(row)
+            if key in core_ids or key in new_core:
+                continue
+            new_core[key] = {
+                "place_url_hash": key[0],
+                "review_id": key[1],
+                "name": row["name"] or "",
+                "stars": float(row["stars"] or 0.0),
+                "avatar": row["avatar"] or "",
+                "profile_link": row["profile_link"] or "",
+                "first_seen_at": row["scraped_at"],
+            }
+        if new_core:
+            conn.execute(insert(core), list(new_core.values()))
+            rids = {rid for _, rid in new_core}
+            for h, rid, pk in conn.execute(
+                select(core.c.place_url_hash, core.c.review_id, core.c.id).where(core.c.review_id.in_(rids))
+            ):
+                core_ids.setdefault((h, rid), pk)
+
+        new_texts = []
+        for row in rows:
+            pk = core_ids[_key(row)]
+            if (pk, row["locale"]) in text_keys:
+                continue
+            text_keys.add((pk, row["locale"]))
+            new_texts.append({
+                "review_pk": pk,
+                "locale": row["locale"],
+                "date": row["date"] or "",
+                "text": row["text"] or "",
+                "scraped_at": row["scraped_at"],
+                "hidden": bool(row.get("hidden") or False),
+            })
+        if new_texts:
+            conn.execute(insert(texts), new_texts)
+            copied += len(new_texts)
+
+    if insp.has_table(LEGACY_REVIEWS_RENAMED):
+        logger.warning(
+            "Legacy table %s already exists; leaving %s in place",
+            LEGACY_REVIEWS_RENAMED, LEGACY_REVIEWS_TABLE,
+        )
+    else:
+        conn.execute(text(f"ALTER TABLE {LEGACY_REVIEWS_TABLE} RENAME TO {LEGACY_REVIEWS_RENAMED}"))
+    logger.info("Migrated %d legacy review rows into review_core/review_texts", copied)
+    return copied
+
+
+def add_missing_columns(conn) -> list[str]:
+    """Add columns from `_ADDED_COLUMNS` that existing tables lack; returns those added."""
+    insp = inspect(conn)
+    added = []
+    for table, column, ddl in _ADDED_COLUMNS:
+        if not insp.has_table(table) or column in {c["name"] for c in insp.get_columns(table)}:
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        added.append(f"{table}.{column}")
+    if added:
+        logger.info("Added columns %s", ", ".join(added))
+    return added
+
+
+async def _backfill_cache_timestamps() -> int:
+    """Give cache markers without `updated_at` one, so they are not all treated as stale."""
+    total = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            ids = (await db.execute(
+                select(ReviewCache.id).where(ReviewCache.updated_at == None).limit(_BATCH)  # noqa: E711
+            )).scalars().all()
+            if not ids:
+                break
+            await db.execute(
+                update(ReviewCache).where(ReviewCache.id.in_(ids)).values(updated_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+            total += len(ids)
+    return total
+
+
+async def _bootstrap_admin() -> bool:
+    """Create ADMIN_EMAIL when registrations are disabled and there are no users yet."""
+    if settings.ALLOW_REGISTRATIONS:
+        return False
+    async with AsyncSessionLocal() as db:
+        if (await db.execute(select(User.id).limit(1))).first() is not None:
+            return False
+        if not (settings.ADMIN_EMAIL and settings.ADMIN_PASSWORD):
+            logger.warning("Registrations are disabled and no users exist; set ADMIN_EMAIL and ADMIN_PASSWORD")
+            return False
+        from app.auth import hash_password_async
+
+        db.add(User(email=settings.ADMIN_EMAIL, password_hash=await hash_password_async(settings.ADMIN_PASSWORD), is_admin=True))
+        await db.commit()
+    logger.info("Created admin user %s", settings.ADMIN_EMAIL)
+    return True
+
+
+async def run_migrations() -> None:
+    """Bring the database up to date: tables, new columns, data migrations, search index, backfills, admin.
+
+    Every step is idempotent. Run once per deploy with `python -m app.migrate` before
+    starting the API and workers, which no longer touch the schema at startup.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        # One-time move of the per-locale `reviews` table into review_core/review_texts
+        await conn.run_sync(migrate_legacy_reviews)
+        mode = await conn.run_sync(ensure_search_index)
+    logger.info("Schema up to date; review search uses %s", mode)
+    backfilled = await _backfill_cache_timestamps()
+    if backfilled:
+        logger.info("Set updated_at on %d cache markers", backfilled)
+    await _bootstrap_admin()
@@ -0,0 +1,17 @@
+import asyncio
+
+from app.db import engine
+from app.log import setup_logging
+from app.migrate import run_migrations
+
+
+async def main() -> None:
+    try:
+        await run_migrations()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
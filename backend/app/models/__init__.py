@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Boolean, ForeignKey, UniqueConstraint, Index, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, JSON, Boolean, ForeignKey, UniqueConstraint, Index, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db import Base
@@ -65,27 +65,159 @@ class ReviewInstance(Base):
     last_run = Column(DateTime(timezone=True), server_default=None, onupdate=func.now())
 
 
-# New table to persist individual reviews per (place_url, locale)
-class ReviewEntry(Base):
-    __tablename__ = "reviews"
+# Individual reviews: one core row per (place, review) shared by all locales...
+class Review(Base):
+    __tablename__ = "review_core"
 
     id = Column(Integer, primary_key=True)
-    place_url = Column(String(1024), index=True, nullable=False)
-    place_url_hash = Column(String(64), index=True, nullable=True)
-    locale = Column(String(10), index=True, nullable=False)
+    place_url_hash = Column(String(64), nullable=False)
     review_id = Column(String(128), nullable=False)
     name = Column(String(255), default="")
-    date = Column(String(64), default="")  # raw date string as scraped
     stars = Column(Float, default=0.0)
-    text = Column(Text, default="")
     avatar = Column(String(1024), default="")
     profile_link = Column(String(1024), default="")
+    first_seen_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    texts = relationship("ReviewText", back_populates="review", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # Also serves lookups by place_url_hash alone (leftmost prefix)
+        UniqueConstraint("place_url_hash", "review_id", name="uq_review_core_place_hash_id"),
+    )
+
+
+# ...plus the locale-specific parts (translated text and date string, moderation state)
+class ReviewText(Base):
+    __tablename__ = "review_texts"
+
+    id = Column(Integer, primary_key=True)
+    review_pk = Column(Integer, ForeignKey("review_core.id", ondelete="CASCADE"), nullable=False)
+    locale = Column(String(10), nullable=False)
+    date = Column(String(64), default="")  # raw date string as scraped
+    text = Column(Text, default="")
     scraped_at = Column(DateTime(timezone=True), server_default=func.now())
-    hidden = Column(Boolean, default=False, index=True)
+    hidden = Column(Boolean, default=False)
+
+    review = relationship("Review", back_populates="texts")
+
+    __table_args__ = (
+        UniqueConstraint("review_pk", "locale", name="uq_review_texts_review_locale"),
+    )
+
+
+# Change version per (place, locale), bumped once per transaction that adds, hides or deletes reviews.
+# Changes at or below `floor` were discarded (bulk cleanup); clients that are older must resync.
+class ReviewVersion(Base):
+    __tablename__ = "review_versions"
+
+    id = Column(Integer, primary_key=True)
+    place_url_hash = Column(String(64), nullable=False)
+    locale = Column(String(10), nullable=False)
+    version = Column(BigInteger, default=0, nullable=False)
+    floor = Column(BigInteger, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("place_url_hash", "locale", name="uq_review_versions_place_hash_locale"),
+    )
+
+
+# One row per review touched by a version (kind: added | changed | removed); review_id rather than
+# a foreign key so removals survive the deleted row
+class ReviewChange(Base):
+    __tablename__ = "review_changes"
+
+    id = Column(Integer, primary_key=True)
+    place_url_hash = Column(String(64), nullable=False)
+    locale = Column(String(10), nullable=False)
+    version = Column(BigInteger, nullable=False)
+    review_id = Column(String(128), nullable=False)
+    kind = Column(String(8), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_review_changes_place_hash_locale_version", "place_url_hash", "locale", "version"),
+    )
+
+
+# What the place page showed at the last full scrape; scheduled refreshes compare a cheap
+# probe against it and skip scrolling when nothing changed (see app.scraper)
+class ScrapeProbe(Base):
+    __tablename__ = "scrape_probes"
+
+    id = Column(Integer, primary_key=True)
+    place_url_hash = Column(String(64), nullable=False)
+    locale = Column(String(10), nullable=False)
+    total_reviews = Column(Integer, nullable=True)
+    newest_review_id = Column(String(128), nullable=True)
+    full_scraped_at = Column(DateTime(timezone=True), nullable=True)
+    probed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("place_url_hash", "locale", name="uq_scrape_probes_place_hash_locale"),
+    )
+
+
+# Profiling history of individual scrapes (one row per place/locale run)
+class ScrapeRun(Base):
+    __tablename__ = "scrape_runs"
+
+    id = Column(Integer, primary_key=True)
+    place_url = Column(String(1024), nullable=False)
+    place_url_hash = Column(String(64), index=True, nullable=False)
+    locale = Column(String(10), nullable=False)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    duration_ms = Column(Integer, default=0, index=True)
+    phases = Column(JSON)  # {"launch": s, "goto": s, "consent": s, "panel_wait": s, "scroll": s, "extract": s}
+    scroll_iterations = Column(Integer, default=0)
+    card_count = Column(Integer, default=0)
+    review_count = Column(Integer, default=0)
+    inserted_count = Column(Integer, default=0)
+    bytes_transferred = Column(BigInteger, default=0)
+    outcome = Column(String(16), default="success")  # success | failure | unchanged (stopped by the probe)
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_scrape_runs_place_hash_started", "place_url_hash", "started_at"),
+    )
+
+
+# Scrape work queue consumed by the out-of-process worker (`python -m app.worker`)
+class ScrapeJob(Base):
+    __tablename__ = "scrape_jobs"
+
+    id = Column(Integer, primary_key=True)
+    place_url = Column(String(1024), nullable=False)
+    place_url_hash = Column(String(64), nullable=False)
+    locale = Column(String(10), nullable=False)
+    sort = Column(String(10), default="newest")
+    probe = Column(Boolean, default=False, nullable=False)  # scheduled refresh: may stop at the probe
+    status = Column(String(16), default="pending", nullable=False)  # pending | running | done | failed | skipped
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String(64), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
 
     __table_args__ = (
-        # Use hash to keep unique key small for MySQL limits
-        UniqueConstraint("place_url_hash", "locale", "review_id", name="uq_review_place_hash_locale_id"),
-        Index("ix_reviews_place_hash_locale", "place_url_hash", "locale"),
+        Index("ix_scrape_jobs_status_id", "status", "id"),
+        Index("ix_scrape_jobs_place_hash_locale_status", "place_url_hash", "locale", "status"),
     )
 
+
+# Background /admin/cleanup runs (chunked deletes; see app.cleanup)
+class CleanupJob(Base):
+    __tablename__ = "cleanup_jobs"
+
+    id = Column(Integer, primary_key=True)
+    params = Column(JSON)  # CleanupRequest as submitted
+    status = Column(String(16), default="pending", nullable=False)  # pending | running | done | failed | cancelled
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    deleted_reviews = Column(Integer, default=0)
+    deleted_cache = Column(Integer, default=0)
+    batches = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)  # last progress write
+    finished_at = Column(DateTime(timezone=True), nullable=True)
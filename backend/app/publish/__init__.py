@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.locales import LOCALES
+from app.models import Domain, ReviewInstance
+from app.responses import compress_body, dumps, review_payloads
+from app.service import PAYLOADS_CHANGED, get_payloads_bulk
+
+logger = logging.getLogger("reviewsflow.publish")
+
+# Layout under SNAPSHOT_DIR (mirrored by frontend/nginx.conf):
+#   open/<public_key>.json            instances whose owner has no domain allowlist
+#   hosts/<host>/<public_key>.json    one copy per allowed host otherwise
+# each with optional .gz/.br siblings.
+OPEN_DIR = "open"
+HOSTS_DIR = "hosts"
+_VARIANT_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+# Only names that are safe as a single path segment are published; anything else is left
+# to the backend (which nginx falls back to when no snapshot file exists).
+_KEY_RE = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+_HOST_RE = re.compile(r"^[a-z0-9][a-z0-9.-]{0,252}$")
+
+# Files smaller than this get no compressed siblings (same threshold as live responses)
+_MIN_COMPRESS_BYTES = 512
+
+# Body digest of every file this process wrote or found up to date, keyed by path
+_PUBLISHED: dict[str, str] = {}
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temporary file in the same directory and rename over `path`."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.chmod(tmp, 0o644)  # nginx runs as another user
+    os.replace(tmp, path)
+
+
+def _publish_file(path: Path, body: bytes, digest: str) -> bool:
+    """Write `path` (and its compressed siblings) unless it already holds `body`."""
+    key = str(path)
+    if _PUBLISHED.get(key) == digest:
+        return False
+    try:
+        if path.read_bytes() == body:
+            _PUBLISHED[key] = digest
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    variants = compress_body(body) if len(body) >= _MIN_COMPRESS_BYTES else {}
+    # Siblings first: a client never gets a compressed body older than the plain one
+    for coding, suffix in _VARIANT_SUFFIXES.items():
+        sibling = path.with_name(path.name + suffix)
+        if coding in variants:
+            _write_atomic(sibling, variants[coding])
+        else:
+            sibling.unlink(missing_ok=True)
+    _write_atomic(path, body)
+    _PUBLISHED[key] = digest
+    return True
+
+
+def _prune(root: Path, keep: set[str]) -> int:
+    """Delete snapshot files (and empty host directories) that are no longer published."""
+    removed = 0
+    dirs = [root / OPEN_DIR]
+    hosts = root / HOSTS_DIR
+    if hosts.is_dir():
+        dirs.extend(d for d in hosts.iterdir() if d.is_dir())
+    for d in dirs:
+        if not d.is_dir():
+            continue
+        for f in d.iterdir():
+            base = f.name
+            for suffix in _VARIANT_SUFFIXES.values():
+                base = base.removesuffix(suffix)
+            if not base.endswith(".json") or str(d / base) in keep:
+                continue
+            try:
+                f.unlink()
+                removed += 1
+            except OSError:
+                logger.warning("Could not remove stale snapshot %s", f, exc_info=True)
+            _PUBLISHED.pop(str(f), None)
+        if d.parent == hosts:
+            try:
+                d.rmdir()  # only succeeds when empty
+            except OSError:
+                pass
+    return removed
+
+
+async def publish_snapshots() -> tuple[int, int]:
+    """Bring SNAPSHOT_DIR in line with the active instances; returns (written, removed) files.
+
+    Payloads are built from stored reviews only (no scrapes) with the same parameters and
+    encoding as GET /public/reviews/{key}, so a snapshot is byte-identical to the response.
+    """
+    root = Path(str(settings.SNAPSHOT_DIR))
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(select(ReviewInstance).where(ReviewInstance.active == True))
+        instances = [i for i in res.scalars().all() if _KEY_RE.match(i.public_key or "")]
+        hosts_by_user: dict[int, set[str]] = {}
+        if instances:
+            res = await db.execute(
+                select(Domain.user_id, Domain.host).where(
+                    Domain.user_id.in_({i.user_id for i in instances}), Domain.active == True
+                )
+            )
+            for user_id, host in res.all():
+                hosts_by_user.setdefault(user_id, set()).add((host or "").strip().lower())
+        wanted: list[tuple] = []
+        owners: list[int] = []
+        for n, inst in enumerate(instances):
+            for loc in inst.locales or settings.DEFAULT_LOCALES or ["en-US"]:
+                if loc in LOCALES:
+                    wanted.append((inst.place_url, loc, inst.min_rating, max(inst.max_reviews or 0, 100), inst.sort))
+                    owners.append(n)
+        payloads = await get_payloads_bulk(db, wanted, refresh=False)
+
+    per_instance: list[list[dict]] = [[] for _ in instances]
+    for n, payload in zip(owners, payloads):
+        per_instance[n].append(payload)
+
+    keep: set[str] = set()
+    written = 0
+    for inst, result in zip(instances, per_instance):
+        # A locale without stored reviews may not be scraped yet; leave it to the backend
+        if not result or any(not p.get("count") for p in result):
+            continue
+        hosts = hosts_by_user.get(inst.user_id)
+        if hosts:
+            # Hosts that cannot be a path segment are only served by the backend
+            targets = [root / HOSTS_DIR / h for h in sorted(hosts) if _HOST_RE.match(h) and ".." not in h]
+        else:
+            targets = [root / OPEN_DIR]
+        body = dumps(review_payloads(result))
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        for d in targets:
+            path = d / f"{inst.public_key}.json"
+            keep.add(str(path))
+            if await asyncio.to_thread(_publish_file, path, body, digest):
+                written += 1
+    removed = await asyncio.to_thread(_prune, root, keep)
+    return written, removed
+
+
+async def snapshot_loop() -> None:
+    """Republish after every review change (or every SNAPSHOT_INTERVAL_SECONDS at the latest)."""
+    interval = max(1, int(settings.SNAPSHOT_INTERVAL_SECONDS))
+    logger.info("Publishing widget snapshots to %s", settings.SNAPSHOT_DIR)
+    while True:
+        PAYLOADS_CHANGED.clear()
+        try:
+            written, removed = await publish_snapshots()
+            if written or removed:
+                logger.info("Snapshots updated: %d written, %d removed", written, removed)
+        except Exception:
+            logger.warning("Snapshot publish failed", exc_info=True)
+        try:
+            await asyncio.wait_for(PAYLOADS_CHANGED.wait(), timeout=interval)
+            await asyncio.sleep(1)  # let a burst of ingests settle into one publish
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from html import escape
+import hashlib
+
+from app.config import settings
+from app.responses import dumps
+
+THEMES = ("dark", "light")
+DESIGNS = ("grid", "list", "badge")
+
+# Rendered fragments keyed by (payload digest, theme, design); a fragment is only
+# re-rendered when the review payload behind it changes.
+_FRAGMENTS: "OrderedDict[tuple[str, str, str], tuple[str, bytes]]" = OrderedDict()
+
+_GOOGLE_ICON = (
+    "https://upload.wikimedia.org/wikipedia/commons/thumb/3/3c/"
+    "Google_Favicon_2025.svg/960px-Google_Favicon_2025.svg.png"
+)
+_STAR_POINTS = "12 2 15.09 8.26 22 9.27 17 14.14 18.18 21.02 12 17.77 5.82 21.02 7 14.14 2 9.27 8.91 8.26 12 2"
+
+# Self-contained styles (host pages do not have the widget's Tailwind build); scoped under .rf-widget
+_STYLE = """<style>
+.rf-widget{box-sizing:border-box;width:100%;padding:24px;border-radius:12px;border:1px solid #27272a;font-family:system-ui,-apple-system,"Segoe UI",Roboto,sans-serif;line-height:1.5}
+.rf-widget *{box-sizing:border-box}
+.rf-dark{background:#09090b;color:#f3f4f6}.rf-light{background:#fff;color:#111827;border-color:#e5e7eb}
+.rf-inner{max-width:56rem;margin:0 auto}
+.rf-header{text-align:center;margin-bottom:32px}.rf-header h2{font-size:1.5rem;font-weight:700;margin:0 0 8px}
+.rf-summary{display:flex;align-items:center;justify-content:center;gap:8px}
+.rf-avg{font-size:1.875rem;font-weight:700}.rf-muted{font-size:.75rem;opacity:.6}
+.rf-stars{display:flex}.rf-stars svg{width:16px;height:16px}
+.rf-on{color:#facc15;fill:#facc15}.rf-dark .rf-off{color:#4b5563}.rf-light .rf-off{color:#d1d5db}
+.rf-grid{display:grid;grid-template-columns:1fr;gap:16px}
+@media(min-width:768px){.rf-grid{grid-template-columns:repeat(2,1fr)}}
+@media(min-width:1024px){.rf-grid{grid-template-columns:repeat(3,1fr)}}
+.rf-list{display:flex;flex-direction:column;gap:16px}
+.rf-card{padding:16px;border-radius:12px;border:1px solid #27272a;box-shadow:0 1px 2px rgba(0,0,0,.05)}
+.rf-dark .rf-card{background:#18181b}.rf-light .rf-card{background:#f9fafb;border-color:#e5e7eb}
+.rf-author{display:flex;align-items:center;gap:12px;margin-bottom:12px}
+.rf-avatar{width:40px;height:40px;border-radius:9999px}
+.rf-name{font-weight:600;font-size:.875rem;margin:0}.rf-date{font-size:.75rem;opacity:.6;margin:0}
+.rf-source{margin-left:auto;width:16px;height:16px}
+.rf-text{font-size:.875rem;opacity:.8;margin:8px 0 0}
+.rf-grid .rf-text{display:-webkit-box;-webkit-line-clamp:4;-webkit-box-orient:vertical;overflow:hidden}
+.rf-badge{display:flex;align-items:center;justify-content:space-between}
+</style>"""
+
+
+def _stars(rating: float) -> str:
+    filled = int(round(float(rating or 0)))
+    icons = "".join(
+        f'<svg class="{"rf-on" if i <= filled else "rf-off"}" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"'
+        f' fill="none" stroke="currentColor" stroke-width="2" stroke-linejoin="round"><polygon points="{_STAR_POINTS}"/></svg>'
+        for i in range(1, 6)
+    )
+    return f'<div class="rf-stars" role="img" aria-label="{float(rating or 0):g} of 5 stars">{icons}</div>'
+
+
+def _card(r: dict) -> str:
+    name = escape(r.get("name") or "")
+    avatar = escape(r.get("avatar") or "")
+    return (
+        '<article class="rf-card"><div class="rf-author">'
+        + (f'<img class="rf-avatar" src="{avatar}" alt="{name}" loading="lazy" referrerpolicy="no-referrer">' if avatar else "")
+        + f'<div><p class="rf-name">{name}</p><p class="rf-date">{escape(r.get("date") or "")}</p></div>'
+        + f'<img class="rf-source" src="{_GOOGLE_ICON}" alt="Google" loading="lazy"></div>'
+        + _stars(r.get("stars") or 0)
+        + f'<p class="rf-text">{escape(r.get("text") or "")}</p></article>'
+    )
+
+
+def render_fragment_html(payload: dict, theme: str = "dark", design: str = "grid") -> str:
+    """Server-side equivalent of the React widget for one locale payload."""
+    avg = float(payload.get("averageRating") or 0.0)
+    count = int(payload.get("count") or 0)
+    locale = escape(str(payload.get("locale") or ""))
+    if design == "badge":
+        body = (
+            f'<div class="rf-card rf-badge"><div class="rf-summary"><span class="rf-avg">{avg:g}</span>'
+            f'<div>{_stars(avg)}<div class="rf-muted">{count} reviews</div></div></div>'
+            '<div class="rf-muted">Powered by Google</div></div>'
+        )
+    else:
+        cards = "".join(_card(r) for r in payload.get("reviews") or [])
+        body = (
+            '<div class="rf-header"><h2>Customer Reviews</h2><div class="rf-summary">'
+            f'<span class="rf-avg">{avg:g}</span>{_stars(avg)}<span class="rf-muted">({count} reviews)</span></div></div>'
+            f'<div class="rf-{"list" if design == "list" else "grid"}">{cards}</div>'
+        )
+    return f'{_STYLE}<div class="rf-widget rf-{theme}" lang="{locale}"><div class="rf-inner">{body}</div></div>'
+
+
+def render_fragment(payload: dict, theme: str = "dark", design: str = "grid") -> tuple[str, bytes]:
+    """Return (etag, utf-8 HTML) for a payload, rendering only when the payload changed."""
+    digest = hashlib.blake2b(dumps(payload), digest_size=16).hexdigest()
+    key = (digest, theme, design)
+    hit = _FRAGMENTS.get(key)
+    if hit is not None:
+        _FRAGMENTS.move_to_end(key)
+        return hit
+    etag = f"{digest}-{theme[0]}{design[0]}"
+    entry = (etag, render_fragment_html(payload, theme, design).encode("utf-8"))
+    _FRAGMENTS[key] = entry
+    while len(_FRAGMENTS) > max(1, int(settings.FRAGMENT_CACHE_SIZE)):
+        _FRAGMENTS.popitem(last=False)
+    return entry
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from typing import Any, Iterable
+import asyncio
+import gzip
+import hashlib
+import json
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from app.config import settings
+from app.schemas import ReviewsResponse
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+try:
+    import brotli  # type: ignore
+except Exception:
+    brotli = None
+
+
+_REVIEWS_RESPONSE_FIELDS = tuple(ReviewsResponse.model_fields.keys())
+
+
+def dumps(content: Any) -> bytes:
+    """Encode trusted, already JSON-shaped content to bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that skips FastAPI's response_model revalidation.
+
+    Routes keep declaring `response_model` for the OpenAPI schema but return this
+    response directly, so payloads built by `app.service` (plain dicts) are encoded
+    once with orjson (when installed) instead of being re-validated through pydantic.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def review_payloads(payloads: Iterable[dict]) -> list[dict]:
+    """Project service payloads onto the public `ReviewsResponse` shape (drops internal keys)."""
+    out: list[dict] = []
+    for p in payloads:
+        out.append({k: p.get(k) for k in _REVIEWS_RESPONSE_FIELDS})
+    return out
+
+
+# Compressed variants of encoded payloads, keyed by body digest. A payload only gets
+# compressed the first time its exact bytes are seen (i.e. once per change).
+_VARIANTS: "OrderedDict[str, dict[str, bytes]]" = OrderedDict()
+
+# Bodies smaller than this are not worth compressing
+_MIN_COMPRESS_BYTES = 512
+
+
+def compress_body(body: bytes) -> dict[str, bytes]:
+    variants = {"gzip": gzip.compress(body, compresslevel=int(settings.GZIP_LEVEL), mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=int(settings.BROTLI_QUALITY))
+    return variants
+
+
+def _encoding_qvalues(accept_encoding: str | None) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    qs: dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qs[token] = q
+    return qs
+
+
+def negotiate_encoding(accept_encoding: str | None, available: Iterable[str]) -> str | None:
+    """Pick the available coding with the highest q-value; brotli wins ties over gzip."""
+    qs = _encoding_qvalues(accept_encoding)
+    best: str | None = None
+    best_q = 0.0
+    for coding in ("br", "gzip"):
+        if coding not in available:
+            continue
+        q = qs.get(coding, qs.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+async def compressed_variants(body: bytes) -> tuple[str, dict[str, bytes]]:
+    """Return (digest, {coding: bytes}) for an encoded body, compressing at most once per body."""
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    variants = _VARIANTS.get(digest)
+    if variants is not None:
+        _VARIANTS.move_to_end(digest)
+        return digest, variants
+    variants = await asyncio.to_thread(compress_body, body) if len(body) >= _MIN_COMPRESS_BYTES else {}
+    _VARIANTS[digest] = variants
+    while len(_VARIANTS) > max(1, int(settings.COMPRESSED_PAYLOAD_CACHE_SIZE)):
+        _VARIANTS.popitem(last=False)
+    return digest, variants
+
+
+async def negotiated_json_response(request: Request, content: Any) -> Response:
+    """Encode `content` once and serve the precompressed variant the client accepts."""
+    return await negotiated_response(request, dumps(content), "application/json")
+
+
+async def negotiated_response(request: Request, body: bytes, media_type: str, etag: str | None = None) -> Response:
+    """Serve `body` (or its precompressed variant) with Vary, and an ETag/304 when `etag` is given."""
+    headers = {"Vary": "Accept-Encoding"}
+    if etag is not None:
+        headers["ETag"] = f'"{etag}"'
+        if etag in (request.headers.get("if-none-match") or ""):
+            return Response(status_code=304, headers=headers)
+    _, variants = await compressed_variants(body)
+    coding = negotiate_encoding(request.headers.get("accept-encoding"), variants.keys())
+    if coding is not None:
+        body = variants[coding]
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import random
+import time
+
+from app.config import settings
+
+logger = logging.getLogger("reviewsflow.retry")
+
+# Pending retries keyed by (place_hash, locale); at most one task per key
+_PENDING: dict[tuple[str, str], asyncio.Task] = {}
+
+
+class _Breaker:
+    """Consecutive scrape failures of one (place, locale); open while `open_until` is in the future."""
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+
+
+# Keyed like _PENDING: a locale that keeps failing is not reset by another locale's success
+_BREAKERS: dict[tuple[str, str], _Breaker] = {}
+
+
+def backoff_delay(attempt: int) -> float:
+    """Delay before retry number `attempt` (1-based): capped exponential with jitter in [d/2, d]."""
+    base = max(1.0, float(settings.RETRY_BASE_SECONDS))
+    cap = max(base, float(settings.RETRY_MAX_SECONDS))
+    delay = min(cap, base * (2 ** max(0, attempt - 1)))
+    return random.uniform(delay / 2, delay)
+
+
+def pause_seconds(failures: int) -> float:
+    """How long a key with `failures` consecutive failures is left alone (no jitter).
+
+    The breaker cooldown once `failures` reaches the threshold, otherwise the retry backoff
+    of that attempt. Used for state shared through the database (queued jobs), where the
+    in-process breaker of the worker is not visible to the API.
+    """
+    if failures <= 0:
+        return 0.0
+    if failures >= max(1, int(settings.BREAKER_FAILURE_THRESHOLD)):
+        return max(0, int(settings.BREAKER_COOLDOWN_MINUTES)) * 60.0
+    base = max(1.0, float(settings.RETRY_BASE_SECONDS))
+    return min(max(base, float(settings.RETRY_MAX_SECONDS)), base * (2 ** (failures - 1)))
+
+
+def circuit_open(place_hash: str, locale: str) -> bool:
+    b = _BREAKERS.get((place_hash, locale))
+    return b is not None and b.open_until > time.monotonic()
+
+
+def record_failure(place_hash: str, locale: str) -> None:
+    key = (place_hash, locale)
+    b = _BREAKERS.get(key)
+    if b is None:
+        b = _BREAKERS[key] = _Breaker()
+    b.failures += 1
+    # Past the threshold every failure (including the half-open trial) re-opens the breaker
+    if b.failures >= max(1, int(settings.BREAKER_FAILURE_THRESHOLD)):
+        b.open_until = time.monotonic() + max(0, int(settings.BREAKER_COOLDOWN_MINUTES)) * 60
+        logger.warning(
+            "Circuit open for place_hash=%s locale=%s after %d consecutive failures; pausing scrapes for %s min",
+            place_hash, locale, b.failures, settings.BREAKER_COOLDOWN_MINUTES,
+        )
+
+
+def record_success(place_hash: str, locale: str) -> None:
+    _BREAKERS.pop((place_hash, locale), None)
+
+
+def is_pending(place_hash: str, locale: str) -> bool:
+    return (place_hash, locale) in _PENDING
+
+
+def register(place_hash: str, locale: str, task: asyncio.Task) -> None:
+    key = (place_hash, locale)
+    _PENDING[key] = task
+    task.add_done_callback(lambda _t: _PENDING.pop(key, None) if _PENDING.get(key) is _t else None)
+
+
+def pending_count() -> int:
+    return len(_PENDING)
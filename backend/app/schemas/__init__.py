@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 from datetime import datetime
 
 class Review(BaseModel):
@@ -18,6 +18,15 @@ class ReviewsResponse(BaseModel):
     averageRating: float
     reviews: List[Review]
 
+class BatchError(BaseModel):
+    status: int
+    detail: str
+
+class BatchReviewsResponse(BaseModel):
+    success: bool
+    results: Dict[str, List[ReviewsResponse]]
+    errors: Dict[str, BatchError]
+
 class ScrapeRequest(BaseModel):
     place_url: HttpUrl
     locales: Optional[List[str]] = None
@@ -161,6 +170,17 @@ class ReviewModeration(BaseModel):
     hidden: bool
 
 
+class ReviewChangesResponse(BaseModel):
+    success: bool
+    locale: str
+    since: int
+    version: int
+    reset: bool                   # true: `added` is the full list, replace the local copy
+    added: List[ReviewModeration]
+    changed: List[ReviewModeration]
+    removed: List[str]            # review ids
+
+
 class ReviewHideRequest(BaseModel):
     locale: str
     reviewId: str
@@ -171,3 +191,47 @@ class ReviewDeleteRequest(BaseModel):
     locale: str
     reviewId: str
 
+
+
+# Scrape profiling
+class ScrapeRunOut(BaseModel):
+    id: int
+    place_url: str
+    locale: str
+    started_at: Optional[datetime]
+    duration_ms: int
+    phases: dict
+    scroll_iterations: int
+    card_count: int
+    review_count: int
+    inserted_count: int
+    bytes_transferred: int
+    outcome: str
+    error: Optional[str] = None
+
+
+class ScrapeRunTrend(BaseModel):
+    day: str
+    locale: str
+    runs: int
+    failures: int
+    unchanged: int = 0  # runs stopped by the probe (no new reviews)
+    avg_duration_ms: float
+    max_duration_ms: int
+    avg_card_count: float
+    avg_phases: dict
+
+
+class CleanupJobOut(BaseModel):
+    id: int
+    status: str
+    params: dict
+    cancel_requested: bool
+    deleted_reviews: int
+    deleted_cache: int
+    batches: int
+    error: Optional[str] = None
+    created_at: Optional[datetime]
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
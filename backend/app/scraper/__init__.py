@@ -1,9 +1,15 @@
 import asyncio
+import importlib.util
+import logging
+import sys
 import time
 import os
+import pathlib
 from datetime import datetime
-from playwright.sync_api import sync_playwright
 from app.config import settings
+from app.locales import LOCALES
+
+logger = logging.getLogger("reviewsflow.scraper")
 
 
 class ScrapeError(Exception):
@@ -17,14 +23,47 @@ class ScrapeError(Exception):
 
 PANEL_SELECTOR = "div.m6QErb.XiKgde.kA9KIf.dS8AEf.XiKgde"
 CARD_SELECTOR = "div[data-review-id]"
+CONSENT_SELECTOR = 'button[jsname="b3VHJd"]'
+SORT_BUTTON_SELECTOR = 'button[data-value="Sort"]'
+SORT_MENU_ITEM_SELECTOR = 'div[role="menuitemradio"]'  # most relevant, newest, highest, lowest
+
+
+def _state_path(locale: str) -> pathlib.Path | None:
+    if not settings.SCRAPER_STATE_DIR:
+        return None
+    return pathlib.Path(settings.SCRAPER_STATE_DIR) / f"storage_state_{locale}.json"
 
 
-def _parse_rating(card) -> float | None:
-    star_el = card.query_selector(".kvMYJc")
-    if not star_el:
+def _load_storage_state(locale: str) -> str | None:
+    """Path of a saved, non-expired consent storage state for this locale, if any."""
+    path = _state_path(locale)
+    if path is None or not path.is_file():
         return None
+    try:
+        if time.time() - path.stat().st_mtime > settings.SCRAPER_STATE_TTL_HOURS * 3600:
+            path.unlink(missing_ok=True)
+            return None
+    except OSError:
+        return None
+    return str(path)
+
 
-    label = star_el.get_attribute("aria-label")
+async def _save_storage_state(context, locale: str) -> None:
+    """Persist cookies/localStorage after consent; atomic so parallel scrapes never read a partial file."""
+    path = _state_path(locale)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{time.monotonic_ns()}.tmp")
+        await context.storage_state(path=str(tmp))
+        os.replace(tmp, path)
+    except Exception:
+        logger.debug("Could not save storage state locale=%s", locale, exc_info=True)
+
+
+def _parse_rating(label: str | None) -> float | None:
+    """Parse the star rating from a `.kvMYJc` aria-label such as "5 stars"."""
     if not label:
         return None
 
@@ -34,6 +73,74 @@ def _parse_rating(card) -> float | None:
         return None
 
 
+# Scrolls the panel, then resolves with the card count as soon as it exceeds `prev`
+# (observed via MutationObserver) or after `timeoutMs`. Runs entirely in the page, so
+# no element handles are created and only a number crosses the wire.
+_SCROLL_AND_WAIT_JS = """
+async ([panelSel, cardSel, prev, timeoutMs]) => {
+    const panel = document.querySelector(panelSel);
+    if (!panel) return -1;
+    const count = () => document.querySelectorAll(cardSel).length;
+    panel.scrollTo(0, panel.scrollHeight);
+    const now = count();
+    if (now > prev) return now;
+    return await new Promise(resolve => {
+        let timer = null;
+        const observer = new MutationObserver(() => {
+            if (count() > prev) finish();
+        });
+        const finish = () => {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(count());
+        };
+        observer.observe(panel, { childList: true, subtree: true });
+        timer = setTimeout(finish, timeoutMs);
+    });
+}
+"""
+
+# Review total from the panel header (digits only, so "1,234 reviews" / "1 234 recenzí" both
+# parse) and the id of the first card, which is the newest one once sorted by newest
+_PROBE_JS = """
+([cardSel]) => {
+    const parse = el => {
+        const digits = el ? (el.innerText || "").replace(/[^0-9]/g, "") : "";
+        return digits ? parseInt(digits, 10) : null;
+    };
+    let total = parse(document.querySelector(".jANrlb .fontBodySmall"));
+    if (total === null) total = parse(document.querySelector(".F7nice > span:last-child"));
+    const first = document.querySelector(cardSel);
+    return { total, newestId: first ? first.getAttribute("data-review-id") : null };
+}
+"""
+
+_FIRST_CARD_CHANGED_JS = """
+([cardSel, before]) => {
+    const c = document.querySelector(cardSel);
+    return !!c && c.getAttribute("data-review-id") !== before;
+}
+"""
+
+# Extracts all card fields in one call instead of several round-trips per card
+_EXTRACT_CARDS_JS = """
+els => els.map(c => {
+    const text = sel => { const el = c.querySelector(sel); return el ? el.innerText : ""; };
+    const star = c.querySelector(".kvMYJc");
+    const avatar = c.querySelector(".NBa7we");
+    return {
+        id: c.getAttribute("data-review-id"),
+        name: text(".d4r55"),
+        date: text(".rsqaWe"),
+        rating: star ? star.getAttribute("aria-label") : null,
+        text: text(".wiI7pd"),
+        avatar: avatar ? (avatar.getAttribute("src") || "") : "",
+        href: c.getAttribute("data-href") || "",
+    };
+})
+"""
+
+
 def _sort_reviews(reviews: list[dict], mode: str) -> list[dict]:
     if mode == "best":
         return sorted(reviews, key=lambda r: r["stars"], reverse=True)
@@ -44,155 +151,395 @@ def _sort_reviews(reviews: list[dict], mode: str) -> list[dict]:
     return reviews
 
 
-def _scrape_sync(
+async def _sort_newest(page) -> bool:
+    """Switch the reviews panel to newest first; False when the sort menu is not available."""
+    try:
+        before = await page.evaluate(
+            "sel => { const c = document.querySelector(sel); return c ? c.getAttribute('data-review-id') : null; }",
+            CARD_SELECTOR,
+        )
+        await page.click(SORT_BUTTON_SELECTOR, timeout=3000)
+        await page.locator(SORT_MENU_ITEM_SELECTOR).nth(1).click(timeout=3000)
+    except Exception:
+        return False
+    try:
+        # The list is replaced in place; the top card stays the same when it already was the newest
+        await page.wait_for_function(_FIRST_CARD_CHANGED_JS, arg=[CARD_SELECTOR, before], timeout=1500)
+    except Exception:
+        pass
+    return True
+
+
+def probe_unchanged(known: dict | None, observed: dict | None) -> bool:
+    """True when a probe shows the same review total (and newest review, if both are known)."""
+    if not known or not observed or observed.get("total") is None:
+        return False
+    if observed.get("total") != known.get("total"):
+        return False
+    if known.get("newest_id") and observed.get("newest_id"):
+        return observed["newest_id"] == known["newest_id"]
+    return True
+
+
+def _browsers_dir() -> pathlib.Path | None:
+    """Where Playwright keeps downloaded browsers (PLAYWRIGHT_BROWSERS_PATH or the OS default)."""
+    env = os.getenv("PLAYWRIGHT_BROWSERS_PATH")
+    if env and env != "0":
+        return pathlib.Path(env)
+    if env == "0":
+        spec = importlib.util.find_spec("playwright")
+        if spec is None or not spec.origin:
+            return None
+        return pathlib.Path(spec.origin).parent / "driver" / "package" / ".local-browsers"
+    home = pathlib.Path.home()
+    if sys.platform == "win32":
+        return pathlib.Path(os.getenv("LOCALAPPDATA") or home / "AppData" / "Local") / "ms-playwright"
+    if sys.platform == "darwin":
+        return home / "Library" / "Caches" / "ms-playwright"
+    return pathlib.Path(os.getenv("XDG_CACHE_HOME") or home / ".cache") / "ms-playwright"
+
+
+def scraper_status() -> tuple[bool, str]:
+    """Whether this process could launch Chromium, without importing Playwright or starting it.
+
+    Checks that the package is installed and that a Chromium build has been downloaded
+    (`python -m playwright install chromium`).
+    """
+    try:
+        if importlib.util.find_spec("playwright") is None:
+            return False, "playwright is not installed"
+        d = _browsers_dir()
+        if d is None or not d.is_dir() or not any(c.name.startswith("chromium") for c in d.iterdir()):
+            return False, f"no Chromium build in {d}"
+    except Exception as e:
+        return False, f"check failed: {e}"
+    return True, "ok"
+
+
+async def _launch_browser(p, locale: str):
+    return await p.chromium.launch(
+        headless=settings.HEADLESS,
+        args=["--no-sandbox", f"--lang={locale}"],
+    )
+
+
+async def _scrape_in_browser(
+    browser,
     place_url: str,
     locale: str,
     cfg: dict,
     min_rating: float,
     max_reviews: int | None,
     sort: str,
-):
-    print(f"[SCRAPER] START {locale}")
+    profile: dict | None = None,
+    launch_seconds: float = 0.0,
+    known: dict | None = None,
+) -> list[dict] | None:
+    """Scrape one locale in its own context of an already running browser.
+
+    `launch_seconds` (time spent starting the browser) is added to the "launch" phase.
+    Only for probing callers (`known` is not None, `{}` when there is no baseline yet) and
+    with SCRAPER_PROBE, the panel is sorted newest first and its review total and newest
+    review id are stored in `profile["probe"]`. When they match `known` (the values of the
+    last full scrape) nothing changed: None is returned without scrolling. Other scrapes
+    (forced refreshes) go straight to the scroll in the page's own order.
+    """
+    logger.info("Scrape start place=%s locale=%s", place_url, locale)
+
+    # Per-phase timings and counters; filled in-place for the caller (see app.service)
+    if profile is None:
+        profile = {}
+    phases: dict[str, float] = {}
+    profile.update({"phases": phases, "scroll_iterations": 0, "card_count": 0, "bytes_transferred": 0, "outcome": "failure"})
+    started = time.perf_counter() - launch_seconds
+    phase_start = started
+
+    def _end_phase(name: str) -> None:
+        nonlocal phase_start
+        now = time.perf_counter()
+        phases[name] = round(now - phase_start, 3)
+        phase_start = now
 
-    screenshot_path: str | None = None
-    with sync_playwright() as p:
-        browser = None
-        context = None
-        page = None
+    def _count_bytes(response) -> None:
         try:
-            browser = p.chromium.launch(
-                headless=settings.HEADLESS,
-                args=["--no-sandbox", f"--lang={locale}"],
-            )
+            profile["bytes_transferred"] += int(response.headers.get("content-length") or 0)
+        except Exception:
+            pass
 
-            context = browser.new_context(
-                locale=locale,
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                extra_http_headers={"Accept-Language": cfg["accept"]},
-                viewport={"width": 1920, "height": 1080},
-            )
+    context = None
+    try:
+        state_file = _load_storage_state(locale)
+        context = await browser.new_context(
+            storage_state=state_file,
+            locale=locale,
+            user_agent=(
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120.0.0.0 Safari/537.36"
+            ),
+            extra_http_headers={"Accept-Language": cfg["accept"]},
+            viewport={"width": 1920, "height": 1080},
+        )
 
-            page = context.new_page()
+        page = await context.new_page()
+        page.on("response", _count_bytes)
 
-            # basic stealth
-            page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-                Object.defineProperty(navigator, 'languages', { get: () => ['cs-CZ', 'cs'] });
-                Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3] });
-            """)
+        # basic stealth
+        await page.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+            Object.defineProperty(navigator, 'languages', { get: () => ['cs-CZ', 'cs'] });
+            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3] });
+        """)
 
-            url = f"{place_url}&hl={cfg['hl']}&gl={cfg['gl']}"
-            page.goto(url, timeout=60000)
+        url = f"{place_url}&hl={cfg['hl']}&gl={cfg['gl']}"
+        _end_phase("launch")
+        await page.goto(url, timeout=60000)
+        _end_phase("goto")
 
-            # cookies
+        # cookies: with a saved consent state the dialog normally does not appear, so wait for
+        # whichever comes first instead of spending up to 5s on a click that cannot succeed
+        consented = False
+        panel_timeout = 30000
+        if state_file:
             try:
-                page.click('button[jsname="b3VHJd"]', timeout=5000)
+                await page.wait_for_selector(f"{PANEL_SELECTOR}, {CONSENT_SELECTOR}", timeout=30000)
+            except Exception:
+                # Already waited the full budget; only re-check the panel briefly below
+                panel_timeout = 1000
+            if await page.query_selector(CONSENT_SELECTOR) is not None:
+                # Saved state no longer accepted; consent again and refresh it below
+                try:
+                    await page.click(CONSENT_SELECTOR, timeout=5000)
+                    consented = True
+                except Exception:
+                    pass
+        else:
+            try:
+                await page.click(CONSENT_SELECTOR, timeout=5000)
+                consented = True
             except Exception:
                 pass
+        _end_phase("consent")
 
-            # Ensure panel is present; if not, capture screenshot and raise a nice error
-            try:
-                page.wait_for_selector(PANEL_SELECTOR, timeout=30000)
-            except Exception as e:
-                msg = (
-                    "Could not locate reviews panel on the page. "
-                    "The site structure may have changed or content failed to load."
+        # Ensure panel is present; if not, capture screenshot and raise a nice error
+        try:
+            await page.wait_for_selector(PANEL_SELECTOR, timeout=panel_timeout)
+        except Exception as e:
+            msg = (
+                "Could not locate reviews panel on the page. "
+                "The site structure may have changed or content failed to load."
+            )
+            logger.warning("Scrape failed place=%s locale=%s: %s", place_url, locale, msg)
+            raise ScrapeError(msg, screenshot=None, place_url=place_url, locale=locale) from e
+        _end_phase("panel_wait")
+        if consented or not state_file:
+            await _save_storage_state(context, locale)
+
+        if settings.SCRAPER_PROBE and known is not None:
+            sorted_newest = await _sort_newest(page)
+            observed = await page.evaluate(_PROBE_JS, [CARD_SELECTOR])
+            profile["probe"] = {
+                "total": observed.get("total"),
+                "newest_id": observed.get("newestId") if sorted_newest else None,
+            }
+            _end_phase("probe")
+            if probe_unchanged(known, profile["probe"]):
+                profile["outcome"] = "unchanged"
+                profile["duration"] = round(time.perf_counter() - started, 3)
+                logger.info(
+                    "Scrape skipped place=%s locale=%s: probe unchanged (total=%s)",
+                    place_url, locale, profile["probe"]["total"],
                 )
-                print(f"[SCRAPER] ERROR {locale}: {msg}")
-                raise ScrapeError(msg, screenshot=None, place_url=place_url, locale=locale) from e
+                return None
 
-            # Aggressive scroll until card growth stalls; aim to exceed desired count by a buffer
-            panel = PANEL_SELECTOR
+        # Aggressive scroll until card growth stalls; aim to exceed desired count by a buffer
+        panel = PANEL_SELECTOR
+        collect_all = False
+        try:
+            collect_all = (max_reviews is None) or (int(max_reviews) <= 0)
+        except Exception:
             collect_all = False
-            try:
-                collect_all = (max_reviews is None) or (int(max_reviews) <= 0)
-            except Exception:
-                collect_all = False
-            try:
-                desired = None if collect_all else max(int(max_reviews) + 30, 50)
-            except Exception:
-                desired = 100
-            STALL_LIMIT = 8
-            MAX_SCROLLS = 1500 if collect_all else max(200, int((int(max_reviews) if max_reviews else 100) * 12))
-            last_count = -1
-            no_growth = 0
-            for _ in range(MAX_SCROLLS):
-                page.eval_on_selector(panel, "el => el.scrollTo(0, el.scrollHeight)")
-                time.sleep(0.5)
-                cards_now = page.query_selector_all(CARD_SELECTOR)
-                cnt = len(cards_now)
-                if not collect_all and desired is not None and cnt >= desired:
-                    break
-                if cnt == last_count:
-                    no_growth += 1
-                else:
-                    no_growth = 0
+        try:
+            desired = None if collect_all else max(int(max_reviews) + 30, 50)
+        except Exception:
+            desired = 100
+        MAX_SCROLLS = 1500 if collect_all else max(200, int((int(max_reviews) if max_reviews else 100) * 12))
+        wait_min_ms = max(50, int(settings.SCRAPER_SCROLL_WAIT_MIN_MS))
+        wait_max_ms = max(wait_min_ms, int(settings.SCRAPER_SCROLL_WAIT_MAX_MS))
+        stall_seconds = float(settings.SCRAPER_STALL_SECONDS)
+        wait_ms = wait_min_ms
+        last_count = -1
+        stalled_since: float | None = None
+        for _ in range(MAX_SCROLLS):
+            profile["scroll_iterations"] += 1
+            cnt = await page.evaluate(_SCROLL_AND_WAIT_JS, [panel, CARD_SELECTOR, last_count, wait_ms])
+            if not collect_all and desired is not None and cnt >= desired:
+                break
+            if cnt > last_count:
                 last_count = cnt
-                if no_growth >= STALL_LIMIT:
-                    break
-
-            cards = page.query_selector_all(CARD_SELECTOR)
-            print(f"[SCRAPER] Cards found: {len(cards)}")
-
-            # Collect unique reviews (dedupe by data-review-id)
-            reviews: list[dict] = []
-            seen_ids: set[str] = set()
-
-            for c in cards:
-                review_id = c.get_attribute("data-review-id")
-                if not review_id or review_id in seen_ids:
-                    continue
-
-                rating = _parse_rating(c)
-                if rating is None or rating < min_rating:
-                    continue
-
-                reviews.append({
-                    "reviewId": review_id,
-                    "name": c.query_selector(".d4r55").inner_text() if c.query_selector(".d4r55") else "",
-                    "date": c.query_selector(".rsqaWe").inner_text() if c.query_selector(".rsqaWe") else "",
-                    "stars": rating,
-                    "text": c.query_selector(".wiI7pd").inner_text() if c.query_selector(".wiI7pd") else "",
-                    "avatar": c.query_selector(".NBa7we").get_attribute("src") if c.query_selector(".NBa7we") else "",
-                    "profileLink": c.get_attribute("data-href") or "",
-                })
-                seen_ids.add(review_id)
-
-                if not collect_all:
-                    try:
-                        if len(reviews) >= int(max_reviews):
-                            break
-                    except Exception:
-                        pass
-
-            reviews = _sort_reviews(reviews, sort)
-            print(f"[SCRAPER] DONE {locale} " + str(len(reviews)) + " reviews")
-            return reviews
-        except ScrapeError:
-            # Already handled with screenshot and message; rethrow
-            raise
+                wait_ms = wait_min_ms
+                stalled_since = None
+                continue
+            # No growth within wait_ms: back off, give up once stalled for stall_seconds
+            if stalled_since is None:
+                stalled_since = time.monotonic()
+            elif time.monotonic() - stalled_since >= stall_seconds:
+                break
+            wait_ms = min(wait_ms * 2, wait_max_ms)
+
+        _end_phase("scroll")
+        cards = await page.eval_on_selector_all(CARD_SELECTOR, _EXTRACT_CARDS_JS)
+        profile["card_count"] = len(cards)
+        logger.debug("Cards found: %d locale=%s", len(cards), locale)
+
+        # Collect unique reviews (dedupe by data-review-id)
+        reviews: list[dict] = []
+        seen_ids: set[str] = set()
+
+        for c in cards:
+            review_id = c.get("id")
+            if not review_id or review_id in seen_ids:
+                continue
+
+            rating = _parse_rating(c.get("rating"))
+            if rating is None or rating < min_rating:
+                continue
+
+            reviews.append({
+                "reviewId": review_id,
+                "name": c.get("name") or "",
+                "date": c.get("date") or "",
+                "stars": rating,
+                "text": c.get("text") or "",
+                "avatar": c.get("avatar") or "",
+                "profileLink": c.get("href") or "",
+            })
+            seen_ids.add(review_id)
+
+            if not collect_all:
+                try:
+                    if len(reviews) >= int(max_reviews):
+                        break
+                except Exception:
+                    pass
+
+        reviews = _sort_reviews(reviews, sort)
+        _end_phase("extract")
+        profile["outcome"] = "success"
+        profile["duration"] = round(time.perf_counter() - started, 3)
+        logger.info("Scrape done place=%s locale=%s reviews=%d", place_url, locale, len(reviews))
+        return reviews
+    except ScrapeError as e:
+        # Already handled with screenshot and message; rethrow
+        profile["error"] = e.message
+        raise
+    except Exception as e:
+        # Generic failure without saving screenshots
+        msg = f"Failed to scrape reviews: {str(e)}"
+        profile["error"] = msg
+        logger.warning("Scrape failed place=%s locale=%s: %s", place_url, locale, msg)
+        raise ScrapeError(msg, screenshot=None, place_url=place_url, locale=locale) from e
+    finally:
+        profile.setdefault("duration", round(time.perf_counter() - started, 3))
+        try:
+            if context is not None:
+                await context.close()
+        except Exception:
+            pass
+
+
+async def _scrape_async(
+    place_url: str,
+    locale: str,
+    cfg: dict,
+    min_rating: float,
+    max_reviews: int | None,
+    sort: str,
+    profile: dict | None = None,
+    known: dict | None = None,
+) -> list[dict] | None:
+    from playwright.async_api import async_playwright  # imported on first scrape, not at app start
+
+    async with async_playwright() as p:
+        launch_start = time.perf_counter()
+        try:
+            browser = await _launch_browser(p, locale)
         except Exception as e:
-            # Generic failure without saving screenshots
             msg = f"Failed to scrape reviews: {str(e)}"
-            print(f"[SCRAPER] ERROR {locale}: {msg}")
+            if profile is not None:
+                profile.update({"outcome": "failure", "error": msg})
+            logger.warning("Scrape failed place=%s locale=%s: %s", place_url, locale, msg)
             raise ScrapeError(msg, screenshot=None, place_url=place_url, locale=locale) from e
+        try:
+            return await _scrape_in_browser(
+                browser, place_url, locale, cfg, min_rating, max_reviews, sort, profile,
+                launch_seconds=time.perf_counter() - launch_start, known=known,
+            )
         finally:
             try:
-                if context is not None:
-                    context.close()
+                await browser.close()
             except Exception:
                 pass
+
+
+async def _scrape_locales_async(
+    place_url: str,
+    locales: list[str],
+    min_rating: float,
+    max_reviews: int | None,
+    sort: str,
+    profiles: dict[str, dict],
+    parallel: int,
+    known: dict[str, dict] | None,
+) -> dict[str, list[dict] | ScrapeError | None]:
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        launch_start = time.perf_counter()
+        try:
+            browser = await _launch_browser(p, locales[0])
+        except Exception as e:
+            msg = f"Failed to scrape reviews: {str(e)}"
+            logger.warning("Scrape failed place=%s locales=%s: %s", place_url, locales, msg)
+            for loc in locales:
+                profiles[loc].update({"outcome": "failure", "error": msg})
+            return {loc: ScrapeError(msg, screenshot=None, place_url=place_url, locale=loc) for loc in locales}
+        launch_seconds = time.perf_counter() - launch_start
+        sem = asyncio.Semaphore(max(1, parallel))
+
+        async def one(loc: str) -> tuple[str, list[dict] | ScrapeError | None]:
+            async with sem:
+                try:
+                    return loc, await _scrape_in_browser(
+                        browser, place_url, loc, LOCALES[loc], min_rating, max_reviews, sort, profiles[loc],
+                        launch_seconds=launch_seconds, known=None if known is None else known.get(loc, {}),
+                    )
+                except ScrapeError as e:
+                    return loc, e
+
+        try:
+            return dict(await asyncio.gather(*(one(loc) for loc in locales)))
+        finally:
             try:
-                if browser is not None:
-                    browser.close()
+                await browser.close()
             except Exception:
                 pass
 
 
+def _scrape_sync(
+    place_url: str,
+    locale: str,
+    cfg: dict,
+    min_rating: float,
+    max_reviews: int | None,
+    sort: str,
+    profile: dict | None = None,
+    known: dict | None = None,
+):
+    # Private event loop: keeps Playwright off the API's loop when run via asyncio.to_thread
+    return asyncio.run(_scrape_async(place_url, locale, cfg, min_rating, max_reviews, sort, profile, known))
+
+
 async def scrape(
     place_url: str,
     locale: str,
@@ -200,7 +547,10 @@ async def scrape(
     min_rating: float,
     max_reviews: int,
     sort: str,
+    profile: dict | None = None,
+    known: dict | None = None,
 ):
+    """Scrape one locale; returns None when `known` is given (probe) and the probe found no change."""
     return await asyncio.to_thread(
         _scrape_sync,
         place_url,
@@ -209,5 +559,41 @@ async def scrape(
         min_rating,
         max_reviews,
         sort,
+        profile,
+        known,
     )
 
+
+async def scrape_locales(
+    place_url: str,
+    locales: list[str],
+    min_rating: float,
+    max_reviews: int,
+    sort: str,
+    profiles: dict[str, dict] | None = None,
+    parallel: int | None = None,
+    known: dict[str, dict] | None = None,
+) -> dict[str, list[dict] | ScrapeError | None]:
+    """Scrape several locales of one place in a single browser, up to `parallel` pages at once.
+
+    Returns a mapping locale -> reviews, locale -> ScrapeError for locales that failed, or
+    locale -> None for locales whose probe matched `known[locale]`. Locales are only probed
+    when `known` is given (locales missing from it probe without a baseline).
+    """
+    if profiles is None:
+        profiles = {}
+    for loc in locales:
+        profiles.setdefault(loc, {})
+    return await asyncio.to_thread(
+        asyncio.run,
+        _scrape_locales_async(
+            place_url,
+            locales,
+            min_rating,
+            max_reviews,
+            sort,
+            profiles,
+            parallel or settings.SCRAPER_PARALLEL_LOCALES,
+            known,
+        ),
+    )
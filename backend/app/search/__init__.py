@@ -0,0 +1,143 @@
+import logging
+import re
+
+from sqlalchemy import Float, Integer, desc, false, inspect, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Review, ReviewText
+
+logger = logging.getLogger("reviewsflow.search")
+
+FTS_TABLE = "review_texts_fts"
+MYSQL_TEXT_INDEX = "ft_review_texts_text"
+MYSQL_NAME_INDEX = "ft_review_core_name"
+
+# Review text and author name per review_texts row (rowid = review_texts.id). Names never change
+# after insert, so they are copied in once; hiding does not touch the index.
+_SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(text, name, tokenize='unicode61 remove_diacritics 2')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON review_texts BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text, name)
+        VALUES (new.id, new.text, (SELECT name FROM review_core WHERE id = new.review_pk));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON review_texts BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF text ON review_texts BEGIN
+        UPDATE {FTS_TABLE} SET text = new.text WHERE rowid = new.id;
+    END""",
+    f"""INSERT INTO {FTS_TABLE}(rowid, text, name)
+        SELECT t.id, t.text, c.name FROM review_texts t JOIN review_core c ON c.id = t.review_pk""",
+)
+
+# Search backend per dialect once detected: "fts5", "mysql" or "like"
+_MODES: dict[str, str] = {}
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def ensure_search_index(conn) -> str:
+    """Create the full-text index for the connection's dialect if missing; returns the mode.
+
+    Runs on a sync connection (`await conn.run_sync(ensure_search_index)`). SQLite gets an FTS5
+    table kept in sync by triggers (filled from existing rows when created), MySQL/MariaDB
+    FULLTEXT indexes on review_texts.text and review_core.name. Other databases, or SQLite
+    builds without FTS5, fall back to LIKE.
+    """
+    dialect = conn.dialect.name
+    insp = inspect(conn)
+    mode = "like"
+    try:
+        if dialect == "sqlite":
+            if not insp.has_table(FTS_TABLE):
+                for stmt in _SQLITE_DDL:
+                    conn.execute(text(stmt))
+                logger.info("Created %s and filled it from review_texts", FTS_TABLE)
+            mode = "fts5"
+        elif dialect in ("mysql", "mariadb"):
+            for table, index, column in (
+                ("review_texts", MYSQL_TEXT_INDEX, "text"),
+                ("review_core", MYSQL_NAME_INDEX, "name"),
+            ):
+                if index not in {ix["name"] for ix in insp.get_indexes(table)}:
+                    conn.execute(text(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index} ({column})"))
+                    logger.info("Created FULLTEXT index %s on %s(%s)", index, table, column)
+            mode = "mysql"
+    except Exception:
+        logger.warning("Full-text index unavailable on %s; review search uses LIKE", dialect, exc_info=True)
+        mode = "like"
+    _MODES[dialect] = mode
+    return mode
+
+
+async def _search_mode(db: AsyncSession) -> str:
+    dialect = db.get_bind().dialect.name
+    mode = _MODES.get(dialect)
+    if mode is None:
+        # Index created by `python -m app.migrate` in another process; detect once
+        conn = await db.connection()
+        mode = await conn.run_sync(_detect_mode)
+        _MODES[dialect] = mode
+    return mode
+
+
+def _detect_mode(conn) -> str:
+    insp = inspect(conn)
+    dialect = conn.dialect.name
+    if dialect == "sqlite" and insp.has_table(FTS_TABLE):
+        return "fts5"
+    if dialect in ("mysql", "mariadb"):
+        names = {ix["name"] for ix in insp.get_indexes("review_texts")} | {ix["name"] for ix in insp.get_indexes("review_core")}
+        if {MYSQL_TEXT_INDEX, MYSQL_NAME_INDEX} <= names:
+            return "mysql"
+    return "like"
+
+
+def search_terms(q: str) -> list[str]:
+    """Words of a search string; operators and quotes of either syntax are dropped."""
+    return _TERM_RE.findall(q or "")[:16]
+
+
+async def apply_search(db: AsyncSession, stmt, q: str):
+    """Restrict a select over Review joined with ReviewText to rows matching every term of `q`.
+
+    Returns the statement with relevance ordering (FTS5 bm25 / MySQL MATCH score); the LIKE
+    fallback keeps stored order. Terms match as prefixes. Callers add their own ordering after it.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return stmt.where(false())
+    mode = await _search_mode(db)
+    if mode == "fts5":
+        match = " ".join(f'"{t}"*' for t in terms)
+        hits = (
+            text(f"SELECT rowid AS id, bm25({FTS_TABLE}, 1.0, 0.5) AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match")
+            .bindparams(match=match)
+            .columns(id=Integer, rank=Float)
+            .subquery("search_hits")
+        )
+        return stmt.join(hits, hits.c.id == ReviewText.id).order_by(hits.c.rank.asc())
+    if mode == "mysql":
+        from sqlalchemy.dialects.mysql import match
+
+        # InnoDB does not index words shorter than innodb_ft_min_token_size (3); those use LIKE
+        indexed = [t for t in terms if len(t) >= 3]
+        short = [t for t in terms if len(t) < 3]
+        if indexed:
+            against = " ".join(f"+{t}*" for t in indexed)
+            in_text = match(ReviewText.text, against=against).in_boolean_mode()
+            in_name = match(Review.name, against=against).in_boolean_mode()
+            # Each IN subquery is answered from its FULLTEXT index; scores are only computed for hits
+            stmt = stmt.where(or_(
+                ReviewText.id.in_(select(ReviewText.id).where(in_text).correlate(None)),
+                Review.id.in_(select(Review.id).where(in_name).correlate(None)),
+            )).order_by(desc(in_text + in_name))
+        return stmt.where(*_like_conditions(short)) if short else stmt
+    return stmt.where(*_like_conditions(terms))
+
+
+def _like_conditions(terms: list[str]) -> list:
+    return [
+        or_(ReviewText.text.icontains(t, autoescape=True), Review.name.icontains(t, autoescape=True))
+        for t in terms
+    ]
@@ -1,55 +1,180 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert
-from app.models import ReviewCache, ReviewEntry
-from app.scraper import scrape
+from sqlalchemy import event, select, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import ReviewCache, Review, ReviewText, ScrapeRun, ScrapeJob, ScrapeProbe
+from app.db import AsyncSessionLocal
+from app.scraper import scrape, scrape_locales
 from app.locales import LOCALES
 from app.config import settings
+from app import metrics, retry
+from app.changes import ADDED, record_changes
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timedelta, timezone
 import asyncio
 import hashlib
+import logging
+import time
+
+logger = logging.getLogger("reviewsflow.service")
 
 _SCRAPE_SEM = asyncio.Semaphore(max(1, int(getattr(settings, "MAX_PLAYWRIGHT_INSTANCES", 2))))
 
 # Temporary: force serving reviews from earliest added -> newest added, regardless of requested sort
 FORCE_OLDEST_ORDER = True
 
-# Per-key lock to avoid concurrent scrapes for the same (place_url, locale)
-_SCRAPE_LOCKS: dict[str, asyncio.Lock] = {}
+# Per-key lock to avoid concurrent scrapes for the same (place_url, locale); entries are
+# dropped as soon as nobody holds or waits on them, so the registry only tracks active keys
+_SCRAPE_LOCKS: dict[str, "_KeyLock"] = {}
+
+metrics.SCRAPE_LOCKS_TRACKED.set_function(lambda: len(_SCRAPE_LOCKS))
+
+# In-flight get_or_scrape work shared by concurrent callers with identical arguments
+_INFLIGHT: dict[tuple, asyncio.Task] = {}
+
+# Set whenever stored reviews change (ingest, moderation); wakes the snapshot publisher early
+PAYLOADS_CHANGED = asyncio.Event()
+
+
+def notify_payloads_changed() -> None:
+    PAYLOADS_CHANGED.set()
+
+
+async def _record_scrape_run(
+    place_url: str,
+    place_hash: str,
+    locale: str,
+    started_at: datetime,
+    duration: float,
+    profile: dict,
+    review_count: int = 0,
+    inserted_count: int = 0,
+) -> None:
+    """Persist profiling data of one scrape (best-effort, own session)."""
+    try:
+        async with AsyncSessionLocal() as db:
+            db.add(ScrapeRun(
+                place_url=place_url,
+                place_url_hash=place_hash,
+                locale=locale,
+                started_at=started_at,
+                duration_ms=int(duration * 1000),
+                phases=profile.get("phases") or {},
+                scroll_iterations=int(profile.get("scroll_iterations") or 0),
+                card_count=int(profile.get("card_count") or 0),
+                review_count=review_count,
+                inserted_count=inserted_count,
+                bytes_transferred=int(profile.get("bytes_transferred") or 0),
+                outcome=str(profile.get("outcome") or "failure"),
+                error=profile.get("error"),
+            ))
+            await db.commit()
+    except Exception:
+        logger.warning("Could not record scrape run place=%s locale=%s", place_url, locale, exc_info=True)
+
+
+async def _known_probes(db: AsyncSession, place_hash: str, locales: list[str], now: datetime) -> dict[str, dict]:
+    """Probe values of the last full scrape per locale, when recent enough to skip another one."""
+    if not settings.SCRAPER_PROBE:
+        return {}
+    cutoff = now - timedelta(hours=max(0, int(settings.PROBE_MAX_SKIP_HOURS)))
+    res = await db.execute(
+        select(ScrapeProbe).where(ScrapeProbe.place_url_hash == place_hash, ScrapeProbe.locale.in_(locales))
+    )
+    known: dict[str, dict] = {}
+    for p in res.scalars().all():
+        at = p.full_scraped_at
+        if at is None or p.total_reviews is None:
+            continue
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=timezone.utc)
+        if at >= cutoff:
+            known[p.locale] = {"total": p.total_reviews, "newest_id": p.newest_review_id}
+    return known
+
+
+async def _record_probe(place_hash: str, locale: str, profile: dict, now: datetime, full: bool) -> None:
+    """Remember what a scrape's probe saw (best-effort, own session); `full` scrapes become the baseline."""
+    observed = profile.get("probe")
+    if not observed:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            res = await db.execute(
+                select(ScrapeProbe).where(ScrapeProbe.place_url_hash == place_hash, ScrapeProbe.locale == locale)
+            )
+            row = res.scalars().first()
+            if row is None:
+                row = ScrapeProbe(place_url_hash=place_hash, locale=locale)
+                db.add(row)
+            row.probed_at = now
+            if full:
+                row.total_reviews = observed.get("total")
+                row.newest_review_id = observed.get("newest_id")
+                row.full_scraped_at = now
+            await db.commit()
+    except Exception:
+        logger.warning("Could not record probe place_hash=%s locale=%s", place_hash, locale, exc_info=True)
 
 
 def _scrape_key(place_url: str, locale: str) -> str:
     return f"{place_url}::{locale}"
 
 
-def _get_lock(key: str) -> asyncio.Lock:
-    lk = _SCRAPE_LOCKS.get(key)
-    if lk is None:
-        lk = asyncio.Lock()
-        _SCRAPE_LOCKS[key] = lk
-    return lk
+class _KeyLock:
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0  # holders + waiters
 
 
-async def _build_payload_from_db(db: AsyncSession, place_url: str, locale: str, min_rating: float, max_reviews: int | None, sort: str, initial_seed: bool = False) -> dict:
+@asynccontextmanager
+async def _key_lock(key: str):
+    entry = _SCRAPE_LOCKS.get(key)
+    if entry is None:
+        entry = _SCRAPE_LOCKS[key] = _KeyLock()
+    if entry.lock.locked():
+        logger.debug("Waiting for scrape lock key=%s", key)
+    entry.users += 1
+    try:
+        async with entry.lock:
+            yield
+    finally:
+        entry.users -= 1
+        if entry.users == 0 and _SCRAPE_LOCKS.get(key) is entry:
+            del _SCRAPE_LOCKS[key]
+
+
+def _payload_order(sort: str, initial_seed: bool) -> list:
     # Temporary behavior: always serve from earliest added to newest (oldest first)
     if FORCE_OLDEST_ORDER:
-        order = [ReviewEntry.scraped_at.asc(), ReviewEntry.id.asc()]
-    else:
-        # Original behavior: newest first except initial seed for newest
-        if sort == "newest" and initial_seed:
-            order = [ReviewEntry.scraped_at.asc(), ReviewEntry.id.asc()]
-        else:
-            order = [ReviewEntry.scraped_at.desc(), ReviewEntry.id.desc()]
+        return [ReviewText.scraped_at.asc(), ReviewText.id.asc()]
+    # Original behavior: newest first except initial seed for newest
+    if sort == "newest" and initial_seed:
+        return [ReviewText.scraped_at.asc(), ReviewText.id.asc()]
+    return [ReviewText.scraped_at.desc(), ReviewText.id.desc()]
+
+
+# Plain columns: avoids hydrating two ORM objects per review
+_PAYLOAD_COLUMNS = (
+    Review.review_id, Review.name, Review.stars, Review.avatar, Review.profile_link,
+    ReviewText.date, ReviewText.text, ReviewText.hidden,
+)
+
+
+async def _build_payload_from_db(db: AsyncSession, place_url: str, locale: str, min_rating: float, max_reviews: int | None, sort: str, initial_seed: bool = False) -> dict:
     place_hash = hashlib.sha256(place_url.encode("utf-8")).hexdigest()
     q = await db.execute(
-        select(ReviewEntry)
-        .where(ReviewEntry.place_url_hash == place_hash, ReviewEntry.locale == locale)
-        .order_by(*order)
+        select(*_PAYLOAD_COLUMNS)
+        .join(ReviewText, ReviewText.review_pk == Review.id)
+        .where(Review.place_url_hash == place_hash, ReviewText.locale == locale)
+        .order_by(*_payload_order(sort, initial_seed))
     )
-    rows = q.scalars().all()
-    try:
-        print(f"[DB] Found {len(rows)} stored reviews for place={place_url} locale={locale}")
-    except Exception:
-        pass
+    rows = q.all()
+    logger.debug("Found %d stored reviews for place=%s locale=%s", len(rows), place_url, locale)
+    return _payload_from_rows(rows, place_url, locale, min_rating, max_reviews, sort)
+
+
+def _payload_from_rows(rows, place_url: str, locale: str, min_rating: float, max_reviews: int | None, sort: str) -> dict:
     items = []
     for r in rows:
         # Skip hidden items
@@ -82,10 +207,10 @@ async def _build_payload_from_db(db: AsyncSession, place_url: str, locale: str,
     if max_reviews and int(max_reviews) > 0:
         items = items[: int(max_reviews)]
     avg = round((sum(x["stars"] for x in items) / max(len(items), 1)), 2) if items else 0.0
-    try:
-        print(f"[DB] Serving {len(items)} reviews (min={min_rating}, max={max_reviews}, sort={sort}) for place={place_url} locale={locale}")
-    except Exception:
-        pass
+    logger.debug(
+        "Serving %d reviews (min=%s, max=%s, sort=%s) for place=%s locale=%s",
+        len(items), min_rating, max_reviews, sort, place_url, locale,
+    )
     return {
         "success": True,
         "locale": locale,
@@ -100,6 +225,390 @@ async def _build_payload_from_db(db: AsyncSession, place_url: str, locale: str,
     }
 
 
+def _cache_state(cached: ReviewCache | None, now: datetime) -> tuple[bool, bool, str]:
+    """(needs_refresh, initial_seed, cache_result) of a TTL marker for a non-forced read."""
+    if not cached or cached.updated_at is None:
+        return True, True, "miss"
+    try:
+        updated_cmp = cached.updated_at.replace(tzinfo=timezone.utc) if cached.updated_at.tzinfo is None else cached.updated_at
+        if (now - updated_cmp) > timedelta(minutes=settings.CACHE_TTL_MINUTES):
+            return True, False, "stale"
+    except Exception:
+        return False, False, "hit"
+    return False, False, "hit"
+
+
+async def _refresh_locked(
+    db: AsyncSession,
+    place_url_str: str,
+    place_hash: str,
+    locale: str,
+    sort: str,
+    force: bool,
+    now: datetime,
+    probe: bool = False,
+) -> None:
+    """Scrape one (place, locale) under its lock unless another caller refreshed it meanwhile.
+
+    With `probe` the full scrape is skipped when the place page shows no change.
+    """
+    key = _scrape_key(place_url_str, locale)
+    lock_wait_start = time.perf_counter()
+    async with _key_lock(key):
+        metrics.SCRAPE_LOCK_WAIT.observe(time.perf_counter() - lock_wait_start)
+        logger.debug("Acquired scrape lock key=%s", key)
+        # Double-check TTL after acquiring lock
+        q = await db.execute(
+            select(ReviewCache)
+            .where(ReviewCache.place_url_hash == place_hash, ReviewCache.locale == locale)
+            .order_by(ReviewCache.updated_at.desc(), ReviewCache.id.desc())
+        )
+        cached = q.scalars().first()
+        still_refresh = True
+        if cached and cached.updated_at is not None:
+            try:
+                updated_cmp = cached.updated_at.replace(tzinfo=timezone.utc) if cached.updated_at.tzinfo is None else cached.updated_at
+                still_refresh = (now - updated_cmp) > timedelta(minutes=settings.CACHE_TTL_MINUTES)
+            except Exception:
+                still_refresh = False
+        if not force and not still_refresh:
+            logger.debug("Skipping scrape, cache fresh key=%s", key)
+            return
+        await _scrape_and_ingest(db, place_url_str, place_hash, locale, sort, cached, now, probe)
+
+
+async def _scrape_and_ingest(
+    db: AsyncSession,
+    place_url_str: str,
+    place_hash: str,
+    locale: str,
+    sort: str,
+    cached: ReviewCache | None,
+    now: datetime,
+    probe: bool = False,
+) -> None:
+    """Run the scraper for one (place, locale), store new reviews and bump the TTL marker."""
+    # {} (probe without a baseline) still records one; None skips the probe entirely
+    known = (await _known_probes(db, place_hash, [locale], now)).get(locale, {}) if probe else None
+    sem_wait_start = time.perf_counter()
+    async with _SCRAPE_SEM:
+        metrics.SCRAPE_SEM_WAIT.observe(time.perf_counter() - sem_wait_start)
+        metrics.SCRAPES_INFLIGHT.inc()
+        scrape_start = time.perf_counter()
+        scrape_started_at = datetime.now(timezone.utc)
+        profile: dict = {}
+        outcome = "failure"
+        try:
+            new_reviews = await scrape(
+                place_url_str,
+                locale,
+                LOCALES[locale],
+                1.0,
+                0,
+                sort,
+                profile=profile,
+                known=known,
+            )
+            outcome = "success" if new_reviews is not None else "unchanged"
+            retry.record_success(place_hash, locale)
+        except Exception:
+            retry.record_failure(place_hash, locale)
+            await _record_scrape_run(
+                place_url_str, place_hash, locale, scrape_started_at,
+                time.perf_counter() - scrape_start, profile,
+            )
+            raise
+        finally:
+            scrape_duration = time.perf_counter() - scrape_start
+            metrics.SCRAPES_INFLIGHT.dec()
+            metrics.SCRAPE_DURATION.labels(locale, outcome).observe(scrape_duration)
+            metrics.SCRAPES.labels(locale, outcome).inc()
+    if new_reviews is None:
+        await _touch_cache_marker(db, place_url_str, place_hash, locale, cached, now)
+        await db.commit()
+        await _record_probe(place_hash, locale, profile, now, full=False)
+        await _record_scrape_run(place_url_str, place_hash, locale, scrape_started_at, scrape_duration, profile)
+        return
+    logger.info("Collected %d reviews for place=%s locale=%s", len(new_reviews), place_url_str, locale)
+    inserted = await _ingest_reviews(db, place_url_str, place_hash, locale, new_reviews, cached, now)
+    await _record_probe(place_hash, locale, profile, now, full=True)
+    await _record_scrape_run(
+        place_url_str, place_hash, locale, scrape_started_at, scrape_duration, profile,
+        review_count=len(new_reviews), inserted_count=inserted,
+    )
+
+
+async def _ingest_reviews(
+    db: AsyncSession,
+    place_url_str: str,
+    place_hash: str,
+    locale: str,
+    new_reviews: list[dict],
+    cached: ReviewCache | None,
+    now: datetime,
+) -> int:
+    """Store reviews not seen before for (place, locale) and bump the TTL marker; returns inserted count."""
+    # Reviews already known for the place (any locale) and those that have text in this locale
+    existing_q = await db.execute(
+        select(Review.review_id, Review.id).where(Review.place_url_hash == place_hash)
+    )
+    core_ids: dict[str, int] = {rid: pk for rid, pk in existing_q.all()}
+    with_text_q = await db.execute(
+        select(Review.review_id)
+        .join(ReviewText, ReviewText.review_pk == Review.id)
+        .where(Review.place_url_hash == place_hash, ReviewText.locale == locale)
+    )
+    with_text = set(with_text_q.scalars().all())
+    new_core: dict[str, dict] = {}
+    fresh: list[dict] = []
+    for r in new_reviews:
+        rid = str(r.get("reviewId") or "")
+        if not rid or rid in with_text:
+            continue
+        with_text.add(rid)
+        fresh.append(r)
+        if rid not in core_ids:
+            new_core[rid] = {
+                "place_url_hash": place_hash,
+                "review_id": rid,
+                "name": r.get("name") or "",
+                "stars": float(r.get("stars") or 0.0),
+                "avatar": r.get("avatar") or "",
+                "profile_link": r.get("profileLink") or "",
+                "first_seen_at": now,
+            }
+    if new_core:
+        core_ids.update(await _insert_core_rows(db, place_hash, list(new_core.values())))
+    to_add = [
+        ReviewText(
+            review_pk=core_ids[str(r.get("reviewId"))],
+            locale=locale,
+            date=r.get("date") or "",
+            text=r.get("text") or "",
+            scraped_at=now,
+        )
+        for r in fresh
+    ]
+    metrics.REVIEWS_INSERTED.labels(locale).observe(len(to_add))
+    if to_add:
+        db.add_all(to_add)
+        await record_changes(db, place_hash, locale, ADDED, [str(r.get("reviewId")) for r in fresh])
+        logger.info(
+            "Inserted %d new reviews (%d new across locales) for place=%s locale=%s",
+            len(to_add), len(new_core), place_url_str, locale,
+        )
+    await _touch_cache_marker(db, place_url_str, place_hash, locale, cached, now)
+    await db.commit()
+    if to_add:
+        notify_payloads_changed()
+    return len(to_add)
+
+
+async def _insert_core_rows(db: AsyncSession, place_hash: str, rows: list[dict]) -> dict[str, int]:
+    """Insert review_core rows, skipping ones another transaction created; returns their ids.
+
+    Locales of one place are ingested concurrently (separate sessions, per-locale locks), so a
+    new place's reviews can be inserted by two transactions at once. The conflicting insert
+    waits for the other transaction and then does nothing instead of failing ours.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        await db.execute(
+            dialect_insert(Review).on_conflict_do_nothing(index_elements=["place_url_hash", "review_id"]),
+            rows,
+        )
+    elif dialect in ("mysql", "mariadb"):
+        await db.execute(insert(Review).prefix_with("IGNORE"), rows)
+    else:
+        for row in rows:
+            try:
+                async with db.begin_nested():
+                    await db.execute(insert(Review), [row])
+            except IntegrityError:
+                pass
+    # Locking read: under REPEATABLE READ (MySQL) a plain SELECT would miss rows committed
+    # by the other transaction after ours started
+    ids: dict[str, int] = {}
+    rids = [r["review_id"] for r in rows]
+    for start in range(0, len(rids), 1000):
+        res = await db.execute(
+            select(Review.review_id, Review.id)
+            .where(Review.place_url_hash == place_hash, Review.review_id.in_(rids[start:start + 1000]))
+            .with_for_update(read=True)
+        )
+        ids.update({rid: pk for rid, pk in res.all()})
+    return ids
+
+
+async def _touch_cache_marker(
+    db: AsyncSession,
+    place_url_str: str,
+    place_hash: str,
+    locale: str,
+    cached: ReviewCache | None,
+    now: datetime,
+) -> None:
+    """Mark (place, locale) as refreshed at `now` (not committed)."""
+    if cached:
+        cached.updated_at = now
+        db.add(cached)
+    else:
+        db.add(ReviewCache(place_url=place_url_str, place_url_hash=place_hash, locale=locale, payload={}, avg_rating=0.0, updated_at=now))
+
+
+async def _refresh_locales_shared(
+    db: AsyncSession, place_url_str: str, locales: list[str], sort: str, probe: bool = False
+) -> None:
+    """Force-scrape several locales of one place in a single browser (one semaphore slot).
+
+    All per-locale locks are held for the duration; locales that scraped fine are ingested
+    before the first failure (if any) is raised. With `probe`, locales whose place page shows
+    no change since their last full scrape are not scrolled.
+    """
+    place_hash = hashlib.sha256(place_url_str.encode("utf-8")).hexdigest()
+    async with AsyncExitStack() as stack:
+        lock_wait_start = time.perf_counter()
+        # Sorted acquisition keeps two multi-locale refreshes of the same place from deadlocking
+        for loc in sorted(locales):
+            await stack.enter_async_context(_key_lock(_scrape_key(place_url_str, loc)))
+        metrics.SCRAPE_LOCK_WAIT.observe(time.perf_counter() - lock_wait_start)
+        known = await _known_probes(db, place_hash, locales, datetime.now(timezone.utc)) if probe else None
+        sem_wait_start = time.perf_counter()
+        async with _SCRAPE_SEM:
+            metrics.SCRAPE_SEM_WAIT.observe(time.perf_counter() - sem_wait_start)
+            metrics.SCRAPES_INFLIGHT.inc()
+            scrape_started_at = datetime.now(timezone.utc)
+            profiles: dict[str, dict] = {loc: {} for loc in locales}
+            try:
+                results = await scrape_locales(place_url_str, locales, 1.0, 0, sort, profiles=profiles, known=known)
+            except Exception as e:
+                results = {loc: e for loc in locales}
+            finally:
+                metrics.SCRAPES_INFLIGHT.dec()
+        first_error: Exception | None = None
+        now = datetime.now(timezone.utc)
+        for loc in locales:
+            result = results.get(loc, RuntimeError(f"No result for locale {loc}"))
+            profile = profiles[loc]
+            duration = float(profile.get("duration") or 0.0)
+            if isinstance(result, Exception):
+                outcome = "failure"
+            else:
+                outcome = "success" if result is not None else "unchanged"
+            metrics.SCRAPE_DURATION.labels(loc, outcome).observe(duration)
+            metrics.SCRAPES.labels(loc, outcome).inc()
+            if outcome == "failure":
+                retry.record_failure(place_hash, loc)
+                await _record_scrape_run(place_url_str, place_hash, loc, scrape_started_at, duration, profile)
+                if first_error is None:
+                    first_error = result
+                continue
+            retry.record_success(place_hash, loc)
+            q = await db.execute(
+                select(ReviewCache)
+                .where(ReviewCache.place_url_hash == place_hash, ReviewCache.locale == loc)
+                .order_by(ReviewCache.updated_at.desc(), ReviewCache.id.desc())
+            )
+            if result is None:
+                await _touch_cache_marker(db, place_url_str, place_hash, loc, q.scalars().first(), now)
+                await db.commit()
+                await _record_probe(place_hash, loc, profile, now, full=False)
+                await _record_scrape_run(place_url_str, place_hash, loc, scrape_started_at, duration, profile)
+                continue
+            logger.info("Collected %d reviews for place=%s locale=%s", len(result), place_url_str, loc)
+            inserted = await _ingest_reviews(db, place_url_str, place_hash, loc, result, q.scalars().first(), now)
+            await _record_probe(place_hash, loc, profile, now, full=True)
+            await _record_scrape_run(
+                place_url_str, place_hash, loc, scrape_started_at, duration, profile,
+                review_count=len(result), inserted_count=inserted,
+            )
+    if first_error is not None:
+        raise first_error
+
+
+def _queue_mode() -> bool:
+    return str(settings.SCRAPER_MODE).lower() == "queue"
+
+
+async def _queued_key_paused(db: AsyncSession, place_hash: str, locale: str) -> bool:
+    """True while the key's recent jobs keep failing (see retry.pause_seconds).
+
+    Counts failed jobs since the last successful one and pauses from the newest failure, so
+    queue mode backs off and opens the breaker like inline mode does. Finished jobs are
+    pruned after a day, which bounds the history.
+    """
+    threshold = max(1, int(settings.BREAKER_FAILURE_THRESHOLD))
+    res = await db.execute(
+        select(ScrapeJob.status, ScrapeJob.finished_at)
+        .where(
+            ScrapeJob.place_url_hash == place_hash,
+            ScrapeJob.locale == locale,
+            ScrapeJob.status.in_(("done", "failed")),
+        )
+        .order_by(ScrapeJob.id.desc())
+        .limit(threshold)
+    )
+    rows = res.all()
+    failures = 0
+    for status, _ in rows:
+        if status != "failed":
+            break
+        failures += 1
+    if not failures or rows[0].finished_at is None:
+        return False
+    last = rows[0].finished_at
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - last).total_seconds() < retry.pause_seconds(failures)
+
+
+async def enqueue_scrape(place_url: str, locale: str, sort: str, probe: bool = False) -> bool:
+    """Queue a scrape for the worker process unless one is already pending or running.
+
+    `probe` marks scheduled refreshes the worker may stop at the probe; forced ones leave it
+    off. A forced request clears the flag of a pending probe job instead of being dropped.
+    Scheduled ones are not queued while the key's last jobs failed within their backoff or
+    breaker cooldown. Uses its own session: callers may be gathering several locales on one
+    request session.
+    """
+    place_hash = hashlib.sha256(place_url.encode("utf-8")).hexdigest()
+    async with AsyncSessionLocal() as db:
+        if probe and await _queued_key_paused(db, place_hash, locale):
+            logger.debug("Not queueing scrape, recent jobs failed place=%s locale=%s", place_url, locale)
+            return False
+        res = await db.execute(
+            select(ScrapeJob.id, ScrapeJob.status, ScrapeJob.probe).where(
+                ScrapeJob.place_url_hash == place_hash,
+                ScrapeJob.locale == locale,
+                ScrapeJob.status.in_(("pending", "running")),
+            ).limit(1)
+        )
+        existing = res.first()
+        if existing is not None:
+            if not probe and existing.probe and existing.status == "pending":
+                await db.execute(
+                    update(ScrapeJob)
+                    .where(ScrapeJob.id == existing.id, ScrapeJob.status == "pending")
+                    .values(probe=False)
+                )
+                await db.commit()
+            return False
+        db.add(ScrapeJob(place_url=place_url, place_url_hash=place_hash, locale=locale, sort=sort, probe=probe, status="pending"))
+        await db.commit()
+    logger.debug("Queued scrape place=%s locale=%s", place_url, locale)
+    return True
+
+
+async def refresh_place_locale(db: AsyncSession, place_url: str, locale: str, sort: str, probe: bool = False) -> None:
+    """Scrape and ingest one (place, locale) in this process regardless of SCRAPER_MODE."""
+    place_hash = hashlib.sha256(place_url.encode("utf-8")).hexdigest()
+    await _refresh_locked(db, place_url, place_hash, locale, sort, True, datetime.now(timezone.utc), probe)
+
+
 async def get_or_scrape(
     db: AsyncSession,
     place_url,
@@ -109,7 +618,84 @@ async def get_or_scrape(
     max_reviews: int | None,
     sort: str,
 ):
+    """TTL check, refresh if needed and payload build for one (place, locale).
+
+    Concurrent callers with the same arguments share one in-flight task (single-flight), so a
+    burst of widget requests costs one cache check, at most one scrape and one payload build.
+    The task runs on its own session and is shielded from the cancellation of any one caller.
+    The caller's transaction on `db` is ended before waiting if it has not written anything. The returned payload is
+    shared: treat it as read-only.
+    """
     place_url_str = str(place_url)
+    key = (place_url_str, locale, bool(force), float(min_rating), int(max_reviews or 0), sort)
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(_get_or_scrape_flight(place_url_str, locale, force, min_rating, max_reviews, sort))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda t: _INFLIGHT.pop(key, None) if _INFLIGHT.get(key) is t else None)
+    else:
+        metrics.COALESCED_REQUESTS.inc()
+    if db is not None:
+        await _release_connection(db)
+    return await asyncio.shield(task)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    # insert()/update()/delete() run through the session do not flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_wrote(session) -> None:
+    session.info.pop("wrote", None)
+
+
+async def _release_connection(db: AsyncSession) -> None:
+    """End the caller's transaction so its pooled connection is returned, if it only read.
+
+    The flight checks out its own connection; a burst of requests each holding two would
+    otherwise exhaust the pool. A transaction that flushed or executed DML (tracked in
+    `db.info["wrote"]`) or has pending changes is left alone: committing it here would
+    commit the caller's unfinished work. Serialized per session because callers gather
+    several get_or_scrape calls on one session.
+    """
+    lock = db.info.get("release_lock")
+    if lock is None:
+        lock = db.info["release_lock"] = asyncio.Lock()
+    async with lock:
+        if db.in_transaction() and not (db.info.get("wrote") or db.new or db.dirty or db.deleted):
+            await db.commit()
+
+
+async def _get_or_scrape_flight(
+    place_url_str: str,
+    locale: str,
+    force: bool,
+    min_rating: float,
+    max_reviews: int | None,
+    sort: str,
+) -> dict:
+    async with AsyncSessionLocal() as db:
+        return await _get_or_scrape(db, place_url_str, locale, force, min_rating, max_reviews, sort)
+
+
+async def _get_or_scrape(
+    db: AsyncSession,
+    place_url_str: str,
+    locale: str,
+    force: bool,
+    min_rating: float,
+    max_reviews: int | None,
+    sort: str,
+) -> dict:
 
     # TTL marker from ReviewCache
     place_hash = hashlib.sha256(place_url_str.encode("utf-8")).hexdigest()
@@ -119,107 +705,102 @@ async def get_or_scrape(
         .order_by(ReviewCache.updated_at.desc(), ReviewCache.id.desc())
     )
     cached = q.scalars().first()
-    needs_refresh = force
     now = datetime.now(timezone.utc)
-    initial_seed = False
-    if not needs_refresh:
-        if not cached or cached.updated_at is None:
-            needs_refresh = True
-            initial_seed = True
-        else:
-            try:
-                updated_cmp = cached.updated_at.replace(tzinfo=timezone.utc) if cached.updated_at.tzinfo is None else cached.updated_at
-                if (now - updated_cmp) > timedelta(minutes=settings.CACHE_TTL_MINUTES):
-                    needs_refresh = True
-            except Exception:
-                needs_refresh = False
+    if force:
+        needs_refresh, initial_seed, cache_result = True, False, "forced"
+    else:
+        needs_refresh, initial_seed, cache_result = _cache_state(cached, now)
+    metrics.CACHE_LOOKUPS.labels(cache_result).inc()
+
+    if needs_refresh and not force and retry.circuit_open(place_hash, locale):
+        # Place keeps failing; serve what is stored instead of launching another browser
+        logger.debug("Skipping refresh, circuit open place=%s locale=%s", place_url_str, locale)
+        needs_refresh = False
 
     if needs_refresh:
-        key = _scrape_key(place_url_str, locale)
-        lock = _get_lock(key)
-        if lock.locked():
-            try:
-                print(f"[LOCK] waiting key={key}")
-            except Exception:
-                pass
-        async with lock:
-            try:
-                print(f"[LOCK] acquired key={key}")
-            except Exception:
-                pass
-            # Double-check TTL after acquiring lock
-            q2 = await db.execute(
-                select(ReviewCache)
-                .where(ReviewCache.place_url_hash == place_hash, ReviewCache.locale == locale)
-                .order_by(ReviewCache.updated_at.desc(), ReviewCache.id.desc())
-            )
-            cached2 = q2.scalars().first()
-            still_refresh = True
-            if cached2 and cached2.updated_at is not None:
-                try:
-                    updated_cmp2 = cached2.updated_at.replace(tzinfo=timezone.utc) if cached2.updated_at.tzinfo is None else cached2.updated_at
-                    still_refresh = (now - updated_cmp2) > timedelta(minutes=settings.CACHE_TTL_MINUTES)
-                except Exception:
-                    still_refresh = False
-            if not force and not still_refresh:
-                try:
-                    print(f"[LOCK] skip scrape; cache fresh key={key}")
-                except Exception:
-                    pass
-            else:
-                async with _SCRAPE_SEM:
-                    new_reviews = await scrape(
-                        place_url_str,
-                        locale,
-                        LOCALES[locale],
-                        1.0,
-                        0,
-                        sort,
-                    )
-                try:
-                    print(f"[SCRAPER] Collected {len(new_reviews)} reviews for place={place_url_str} locale={locale}")
-                except Exception:
-                    pass
-                # Insert unique
-                existing_q = await db.execute(
-                    select(ReviewEntry.review_id).where(ReviewEntry.place_url_hash == place_hash, ReviewEntry.locale == locale)
-                )
-                existing_ids = set(existing_q.scalars().all())
-                to_add = []
-                for r in new_reviews:
-                    rid = str(r.get("reviewId") or "")
-                    if not rid or rid in existing_ids:
-                        continue
-                    entry = ReviewEntry(
-                        place_url=place_url_str,
-                        place_url_hash=place_hash,
-                        locale=locale,
-                        review_id=rid,
-                        name=r.get("name") or "",
-                        date=r.get("date") or "",
-                        stars=float(r.get("stars") or 0.0),
-                        text=r.get("text") or "",
-                        avatar=r.get("avatar") or "",
-                        profile_link=r.get("profileLink") or "",
-                        scraped_at=now,
-                    )
-                    to_add.append(entry)
-                if to_add:
-                    db.add_all(to_add)
-                    try:
-                        print(f"[DB] Inserted {len(to_add)} new reviews for place={place_url_str} locale={locale}")
-                    except Exception:
-                        pass
-                if cached2:
-                    cached2.updated_at = now
-                    db.add(cached2)
-                else:
-                    db.add(ReviewCache(place_url=place_url_str, place_url_hash=place_hash, locale=locale, payload={}, avg_rating=0.0, updated_at=now))
-                await db.commit()
+        if _queue_mode():
+            # Scraping happens in `python -m app.worker`; serve what is stored meanwhile
+            await enqueue_scrape(place_url_str, locale, sort, probe=not force)
+        else:
+            # Only explicit force refreshes always scroll; TTL refreshes probe first
+            await _refresh_locked(db, place_url_str, place_hash, locale, sort, force, now, probe=not force)
 
     return await _build_payload_from_db(db, place_url_str, locale, min_rating, max_reviews, sort, initial_seed=initial_seed)
 
 
+async def get_payloads_bulk(
+    db: AsyncSession,
+    wanted: list[tuple[str, str, float, int | None, str]],
+    refresh: bool = True,
+) -> list[dict]:
+    """Payloads for many (place_url, locale, min_rating, max_reviews, sort) at once.
+
+    Fresh entries are served from one TTL-marker query and one review query for all of them;
+    entries that need a refresh go through get_or_scrape individually. With `refresh=False`
+    everything is built from the stored reviews and nothing is scraped or counted as a cache
+    lookup. Results keep the order of `wanted`.
+    """
+    if not wanted:
+        return []
+    now = datetime.now(timezone.utc)
+    hashes = {w[0]: hashlib.sha256(w[0].encode("utf-8")).hexdigest() for w in wanted}
+    locales = {w[1] for w in wanted}
+    markers: dict[tuple[str, str], ReviewCache] = {}
+    if refresh:
+        q = await db.execute(
+            select(ReviewCache)
+            .where(ReviewCache.place_url_hash.in_(set(hashes.values())), ReviewCache.locale.in_(locales))
+            .order_by(ReviewCache.updated_at.desc(), ReviewCache.id.desc())
+        )
+        for c in q.scalars().all():
+            markers.setdefault((c.place_url_hash, c.locale), c)
+
+    fresh: set[tuple[str, str]] = set()
+    for place_url, locale, *_ in wanted:
+        if not refresh:
+            fresh.add((hashes[place_url], locale))
+            continue
+        needs_refresh, _seed, cache_result = _cache_state(markers.get((hashes[place_url], locale)), now)
+        if not needs_refresh:
+            metrics.CACHE_LOOKUPS.labels(cache_result).inc()
+            fresh.add((hashes[place_url], locale))
+
+    grouped: dict[tuple[str, str], list] = {key: [] for key in fresh}
+    if fresh:
+        q = await db.execute(
+            select(Review.place_url_hash, ReviewText.locale, *_PAYLOAD_COLUMNS)
+            .join(ReviewText, ReviewText.review_pk == Review.id)
+            .where(
+                Review.place_url_hash.in_({h for h, _ in fresh}),
+                ReviewText.locale.in_({loc for _, loc in fresh}),
+            )
+            .order_by(*_payload_order("", False))
+        )
+        for r in q.all():
+            bucket = grouped.get((r.place_url_hash, r.locale))
+            if bucket is not None:
+                bucket.append(r)
+
+    out: list[dict | None] = []
+    stale: list[tuple[int, tuple]] = []
+    for i, w in enumerate(wanted):
+        place_url, locale, min_rating, max_reviews, sort = w
+        rows = grouped.get((hashes[place_url], locale))
+        if rows is None:
+            out.append(None)
+            stale.append((i, w))
+        else:
+            out.append(_payload_from_rows(rows, place_url, locale, min_rating, max_reviews, sort))
+    if stale:
+        refreshed = await asyncio.gather(*(
+            get_or_scrape(db, place_url, locale, False, min_rating, max_reviews, sort)
+            for _, (place_url, locale, min_rating, max_reviews, sort) in stale
+        ))
+        for (i, _w), payload in zip(stale, refreshed):
+            out[i] = payload
+    return out
+
+
 async def force_refresh_locales(
     db: AsyncSession,
     place_url: str,
@@ -227,7 +808,30 @@ async def force_refresh_locales(
     min_rating: float,
     max_reviews: int,
     sort: str,
+    probe: bool = False,
 ):
+    """Refresh `locales` of a place now and return their payloads.
+
+    `probe` (scheduled refreshes) lets unchanged locales skip the full scrape; in queue mode
+    the jobs are queued with that flag and stored reviews are returned meanwhile.
+    """
+    valid = [loc for loc in dict.fromkeys(locales) if loc in LOCALES]
+    if len(valid) > 1 and not _queue_mode() and int(settings.SCRAPER_PARALLEL_LOCALES) > 1:
+        # One browser, one page per locale; payloads are then served from the DB as usual
+        await _refresh_locales_shared(db, str(place_url), valid, sort, probe)
+        return [
+            await _build_payload_from_db(db, str(place_url), loc, min_rating, max_reviews, sort)
+            for loc in valid
+        ]
+    if probe:
+        results = []
+        for loc in valid:
+            if _queue_mode():
+                await enqueue_scrape(str(place_url), loc, sort, probe=True)
+            else:
+                await refresh_place_locale(db, str(place_url), loc, sort, probe=True)
+            results.append(await _build_payload_from_db(db, str(place_url), loc, min_rating, max_reviews, sort))
+        return results
     results = []
     for loc in locales:
         if loc not in LOCALES:
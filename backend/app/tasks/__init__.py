@@ -1,4 +1,7 @@
 import asyncio
+import hashlib
+import logging
+import time
 from datetime import datetime, timezone, timedelta
 from sqlalchemy import select
 from app.db import AsyncSessionLocal
@@ -6,6 +9,9 @@ from app.models import ReviewInstance, MonitoredPlace
 from app.service import force_refresh_locales
 from app.locales import LOCALES
 from app.config import settings
+from app import metrics, retry
+
+logger = logging.getLogger("reviewsflow.tasks")
 
 
 async def background_refresh(place_url: str, locales: list[str]):
@@ -39,6 +45,7 @@ async def warm_instance(instance_id: int):
 
 async def monitor_loop():
     while True:
+        tick_start = time.perf_counter()
         try:
             async with AsyncSessionLocal() as db:
                 now = datetime.now(timezone.utc)
@@ -56,15 +63,25 @@ async def monitor_loop():
                             mr = mr.replace(tzinfo=timezone.utc)
                             delta = now - mr
                         due = delta > timedelta(minutes=m.interval_minutes)
+                        if due:
+                            metrics.MONITOR_DUE_LAG.labels("monitor").observe(
+                                (delta - timedelta(minutes=m.interval_minutes)).total_seconds()
+                            )
+                    if due:
+                        place_hash = hashlib.sha256(m.place_url.encode("utf-8")).hexdigest()
+                        locales = [loc for loc in (m.locales or []) if loc in LOCALES] or list(LOCALES.keys())
+                        # Locales that keep failing are picked up again once their breaker cools down
+                        locales = [loc for loc in locales if not retry.circuit_open(place_hash, loc)]
+                        due = bool(locales)
                     if due:
-                        locales = [loc for loc in (m.locales or []) if loc in LOCALES]
                         await force_refresh_locales(
                             db,
                             m.place_url,
-                            locales or list(LOCALES.keys()),
+                            locales,
                             1.0,
                             0,
                             m.sort,
+                            probe=True,
                         )
                         m.last_run = datetime.now(timezone.utc)
                         db.add(m)
@@ -85,15 +102,25 @@ async def monitor_loop():
                             ir = ir.replace(tzinfo=timezone.utc)
                             delta = now - ir
                         due = delta > timedelta(minutes=inst.interval_minutes)
+                        if due:
+                            metrics.MONITOR_DUE_LAG.labels("instance").observe(
+                                (delta - timedelta(minutes=inst.interval_minutes)).total_seconds()
+                            )
+                    if due:
+                        place_hash = hashlib.sha256(inst.place_url.encode("utf-8")).hexdigest()
+                        locales = [loc for loc in (inst.locales or []) if loc in LOCALES] or list(LOCALES.keys())
+                        # Locales that keep failing are picked up again once their breaker cools down
+                        locales = [loc for loc in locales if not retry.circuit_open(place_hash, loc)]
+                        due = bool(locales)
                     if due:
-                        locales = [loc for loc in (inst.locales or []) if loc in LOCALES]
                         await force_refresh_locales(
                             db,
                             inst.place_url,
-                            locales or list(LOCALES.keys()),
+                            locales,
                             1.0,
                             0,
                             inst.sort,
+                            probe=True,
                         )
                         inst.last_run = datetime.now(timezone.utc)
                         db.add(inst)
@@ -101,26 +128,43 @@ async def monitor_loop():
         except Exception:
             # continue loop on errors
             pass
+        metrics.MONITOR_TICK_DURATION.observe(time.perf_counter() - tick_start)
         await asyncio.sleep(settings.MONITOR_POLL_SECONDS)
 
 
-async def _retry_scrape_loop(place_url: str, locales: list[str], delay_seconds: int = 300):
-    while True:
+async def _retry_scrape_loop(place_url: str, place_hash: str, locale: str, first_delay: float | None = None):
+    """Retry one (place, locale) with capped exponential backoff until it succeeds, runs out of
+    attempts or the circuit breaker of (place, locale) opens. Failures are counted by app.service."""
+    max_attempts = max(1, int(settings.RETRY_MAX_ATTEMPTS))
+    for attempt in range(1, max_attempts + 1):
+        delay = first_delay if (attempt == 1 and first_delay is not None) else retry.backoff_delay(attempt)
+        await asyncio.sleep(delay)
+        if retry.circuit_open(place_hash, locale):
+            logger.info("Retry abandoned, circuit open place=%s locale=%s", place_url, locale)
+            return
         try:
             async with AsyncSessionLocal() as db:
-                await force_refresh_locales(db, place_url, locales, 1.0, 0, "newest")
-            print(f"[RETRY] Success scraping place={place_url} locales={locales}")
+                await force_refresh_locales(db, place_url, [locale], 1.0, 0, "newest")
+            logger.info("Retry succeeded place=%s locale=%s attempt=%d", place_url, locale, attempt)
             return
         except Exception as e:
-            # Keep retrying on any error after delay
-            print(f"[RETRY] Failed scrape place={place_url} err={e}. Retrying in {delay_seconds}s")
-        await asyncio.sleep(delay_seconds)
-
+            logger.warning("Retry failed place=%s locale=%s attempt=%d/%d err=%s", place_url, locale, attempt, max_attempts, e)
+    logger.warning("Giving up retries place=%s locale=%s after %d attempts", place_url, locale, max_attempts)
 
-def schedule_rescrape(place_url: str, locales: list[str], delay_seconds: int = 300):
-    try:
-        asyncio.create_task(_retry_scrape_loop(place_url, locales, delay_seconds))
-        print(f"[RETRY] Scheduled rescrape in {delay_seconds}s for place={place_url} locales={locales}")
-    except Exception:
-        pass
 
+def schedule_rescrape(place_url: str, locales: list[str], delay_seconds: float | None = None):
+    """Schedule a retry per locale unless one is already pending or its circuit is open."""
+    place_hash = hashlib.sha256(place_url.encode("utf-8")).hexdigest()
+    for loc in locales:
+        try:
+            if retry.is_pending(place_hash, loc):
+                logger.debug("Retry already pending place=%s locale=%s", place_url, loc)
+                continue
+            if retry.circuit_open(place_hash, loc):
+                logger.info("Not scheduling retry, circuit open place=%s locale=%s", place_url, loc)
+                continue
+            task = asyncio.create_task(_retry_scrape_loop(place_url, place_hash, loc, delay_seconds))
+            retry.register(place_hash, loc, task)
+            logger.info("Scheduled rescrape place=%s locale=%s", place_url, loc)
+        except Exception:
+            pass
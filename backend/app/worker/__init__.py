@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, delete
+
+from app import retry
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.locales import LOCALES
+from app.models import ScrapeJob
+from app.service import refresh_place_locale
+
+logger = logging.getLogger("reviewsflow.worker")
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def _claim_next_job() -> ScrapeJob | None:
+    """Atomically move the oldest pending job to running; None when the queue is empty."""
+    async with AsyncSessionLocal() as db:
+        for _ in range(5):
+            res = await db.execute(
+                select(ScrapeJob.id).where(ScrapeJob.status == "pending").order_by(ScrapeJob.id.asc()).limit(1)
+            )
+            job_id = res.scalars().first()
+            if job_id is None:
+                return None
+            claimed = await db.execute(
+                update(ScrapeJob)
+                .where(ScrapeJob.id == job_id, ScrapeJob.status == "pending")
+                .values(
+                    status="running",
+                    worker_id=WORKER_ID,
+                    started_at=datetime.now(timezone.utc),
+                    attempts=ScrapeJob.attempts + 1,
+                )
+            )
+            await db.commit()
+            if claimed.rowcount == 1:
+                res = await db.execute(select(ScrapeJob).where(ScrapeJob.id == job_id))
+                return res.scalars().first()
+            # Another worker took it; try the next one
+    return None
+
+
+async def _finish_job(job_id: int, status: str, error: str | None = None) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ScrapeJob)
+            .where(ScrapeJob.id == job_id)
+            .values(status=status, error=error, finished_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+
+
+async def _run_job(job: ScrapeJob) -> None:
+    if job.locale not in LOCALES:
+        await _finish_job(job.id, "failed", f"Unknown locale {job.locale}")
+        return
+    if job.probe and retry.circuit_open(job.place_url_hash, job.locale):
+        # Scheduled refresh of a key that keeps failing in this worker; forced jobs still run
+        logger.info("Job %s skipped, circuit open place=%s locale=%s", job.id, job.place_url, job.locale)
+        await _finish_job(job.id, "skipped", "circuit open")
+        return
+    logger.info("Job %s start place=%s locale=%s", job.id, job.place_url, job.locale)
+    try:
+        async with AsyncSessionLocal() as db:
+            # Scheduled refreshes probe first; forced ones (probe off) always scroll
+            await refresh_place_locale(db, job.place_url, job.locale, job.sort or "newest", probe=bool(job.probe))
+    except Exception as e:
+        logger.warning("Job %s failed place=%s locale=%s: %s", job.id, job.place_url, job.locale, getattr(e, "message", e))
+        await _finish_job(job.id, "failed", str(getattr(e, "message", e))[:2000])
+        return
+    await _finish_job(job.id, "done")
+    logger.info("Job %s done place=%s locale=%s", job.id, job.place_url, job.locale)
+
+
+async def _housekeeping() -> None:
+    """Requeue jobs of crashed workers and prune old finished jobs."""
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ScrapeJob)
+            .where(
+                ScrapeJob.status == "running",
+                ScrapeJob.started_at < now - timedelta(minutes=settings.SCRAPE_JOB_TIMEOUT_MINUTES),
+            )
+            .values(status="pending", worker_id=None)
+        )
+        await db.execute(
+            delete(ScrapeJob).where(
+                ScrapeJob.status.in_(("done", "failed", "skipped")),
+                ScrapeJob.finished_at < now - timedelta(days=1),
+            )
+        )
+        await db.commit()
+
+
+async def run_worker() -> None:
+    """Consume scrape jobs until cancelled, running up to WORKER_CONCURRENCY at once."""
+    concurrency = max(1, int(settings.WORKER_CONCURRENCY or settings.MAX_PLAYWRIGHT_INSTANCES))
+    poll = max(0.1, float(settings.WORKER_POLL_SECONDS))
+    logger.info("Scraper worker %s started (concurrency=%d)", WORKER_ID, concurrency)
+    running: set[asyncio.Task] = set()
+    last_housekeeping = 0.0
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            if loop.time() - last_housekeeping > 60:
+                await _housekeeping()
+                last_housekeeping = loop.time()
+            while len(running) < concurrency:
+                job = await _claim_next_job()
+                if job is None:
+                    break
+                running.add(asyncio.create_task(_run_job(job)))
+        except Exception:
+            logger.exception("Worker poll failed")
+        if running:
+            done, _ = await asyncio.wait(running, timeout=poll, return_when=asyncio.FIRST_COMPLETED)
+            running -= done
+        else:
+            await asyncio.sleep(poll)
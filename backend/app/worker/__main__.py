@@ -0,0 +1,20 @@
+import asyncio
+
+from app.db import engine
+from app.log import setup_logging
+from app.metrics import instrument_engine
+from app.worker import run_worker
+
+
+async def main() -> None:
+    # Schema is managed by `python -m app.migrate`
+    await run_worker()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    instrument_engine(engine)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
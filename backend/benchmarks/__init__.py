@@ -0,0 +1,2 @@
+# Standalone benchmark scripts; run from the backend directory, e.g.
+#   python -m benchmarks.serialization
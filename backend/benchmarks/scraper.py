@@ -0,0 +1,251 @@
+"""Offline scraper benchmark against a local fixture that mimics the Maps reviews panel.
+
+A local HTTP server serves a page with the `PANEL_SELECTOR` panel. Review cards
+(`data-review-id`) are lazy-loaded in batches via fetch() when the panel is scrolled to
+the bottom, like the real page. Each scrape runs in a fresh child process so wall time,
+CPU and peak RSS of the whole process tree (Python, Playwright driver, Chromium) are
+measured per run, with no network access needed.
+
+Usage (from the backend directory; requires `python -m playwright install chromium`):
+    python -m benchmarks.scraper [--counts 100 1000 5000] [--batch 10] [--latency-ms 50] [--repeat 1] [--probe]
+
+The page also has the review total header and the sort menu used by the probe stage. With
+`--probe` every count is scraped a second time with the first run's probe values, which is
+what a scheduled refresh of an unchanged place costs.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import resource
+import string
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.locales import LOCALES
+
+_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Fixture place</title>
+<style>
+  .m6QErb {{ height: 900px; overflow-y: scroll; width: 420px; }}
+  [data-review-id] {{ padding: 8px; border-bottom: 1px solid #ddd; min-height: 120px; }}
+</style></head>
+<body>
+<div class="jANrlb"><div class="fontBodySmall">{total} reviews</div></div>
+<button data-value="Sort" onclick="document.getElementById('menu').hidden = false">Sort</button>
+<div id="menu" hidden>
+  <div role="menuitemradio">Most relevant</div>
+  <div role="menuitemradio" onclick="document.getElementById('menu').hidden = true">Newest</div>
+</div>
+<div class="m6QErb XiKgde kA9KIf dS8AEf XiKgde" id="panel"></div>
+<script>
+  const total = {total};
+  const batch = {batch};
+  let loaded = 0;
+  let loading = false;
+  const panel = document.getElementById('panel');
+  function card(r) {{
+    const el = document.createElement('div');
+    el.setAttribute('data-review-id', r.id);
+    el.setAttribute('data-href', 'https://www.google.com/maps/contrib/' + r.id);
+    el.innerHTML = '<img class="NBa7we" src="https://lh3.googleusercontent.com/a/' + r.id + '">' +
+      '<div class="d4r55">' + r.name + '</div>' +
+      '<span class="kvMYJc" aria-label="' + r.stars + ' stars"></span>' +
+      '<span class="rsqaWe">' + r.date + '</span>' +
+      '<span class="wiI7pd">' + r.text + '</span>';
+    return el;
+  }}
+  async function more() {{
+    if (loading || loaded >= total) return;
+    loading = true;
+    const res = await fetch('/batch?offset=' + loaded + '&limit=' + batch);
+    const rows = await res.json();
+    rows.forEach(r => panel.appendChild(card(r)));
+    loaded += rows.length;
+    loading = false;
+  }}
+  panel.addEventListener('scroll', () => {{
+    if (panel.scrollTop + panel.clientHeight >= panel.scrollHeight - 200) more();
+  }});
+  more();
+</script>
+</body></html>
+"""
+
+
+class _FixtureState:
+    def __init__(self, total: int, batch: int, latency_ms: int):
+        self.total = total
+        self.batch = batch
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self.lock = threading.Lock()
+        rnd = random.Random(7)
+        words = ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(2, 9))) for _ in range(500)]
+        self.reviews = [
+            {
+                "id": f"ChZDSUhNMG9nS0VJQ0FnSUR{i:06d}",
+                "name": f"Reviewer {i}",
+                "stars": rnd.randint(1, 5),
+                "date": f"{rnd.randint(1, 11)} months ago",
+                "text": " ".join(rnd.choices(words, k=rnd.randint(5, 120))),
+            }
+            for i in range(total)
+        ]
+
+
+def _handler(state: _FixtureState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body: bytes, ctype: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            with state.lock:
+                state.requests += 1
+            url = urlparse(self.path)
+            if url.path == "/batch":
+                qs = parse_qs(url.query)
+                offset = int(qs.get("offset", ["0"])[0])
+                limit = int(qs.get("limit", [str(state.batch)])[0])
+                time.sleep(state.latency_ms / 1000.0)
+                self._send(json.dumps(state.reviews[offset:offset + limit]).encode("utf-8"), "application/json")
+            elif url.path.startswith("/maps/place"):
+                self._send(_PAGE.format(total=state.total, batch=state.batch).encode("utf-8"), "text/html; charset=utf-8")
+            else:
+                self.send_response(404)
+                self.end_headers()
+
+    return Handler
+
+
+def _tree_rss_bytes(root_pid: int) -> int:
+    """Sum RSS of a process and all its descendants (Linux /proc; 0 elsewhere)."""
+    try:
+        children: dict[int, list[int]] = {}
+        rss: dict[int, int] = {}
+        page = os.sysconf("SC_PAGE_SIZE")
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{name}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                pid = int(name)
+                children.setdefault(int(fields[1]), []).append(pid)
+                rss[pid] = int(fields[21]) * page
+            except Exception:
+                continue
+        total, stack = 0, [root_pid]
+        while stack:
+            pid = stack.pop()
+            total += rss.get(pid, 0)
+            stack.extend(children.get(pid, []))
+        return total
+    except Exception:
+        return 0
+
+
+def _count_protocol_calls() -> list[int]:
+    """Count Python -> Playwright driver round-trips (private API; best-effort)."""
+    counter = [0]
+    try:
+        from playwright._impl import _connection
+
+        original = _connection.Channel.send
+
+        async def send(self, *args, **kwargs):
+            counter[0] += 1
+            return await original(self, *args, **kwargs)
+
+        _connection.Channel.send = send
+    except Exception:
+        counter[0] = -1
+    return counter
+
+
+def _run_one(url: str, out: "mp.Queue", known: dict | None = None) -> None:
+    from app.scraper import _scrape_sync
+
+    calls = _count_protocol_calls()
+    peak = [0]
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.is_set():
+            peak[0] = max(peak[0], _tree_rss_bytes(os.getpid()))
+            done.wait(0.1)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    profile: dict = {}
+    t0 = time.perf_counter()
+    error = None
+    reviews: list = []
+    try:
+        reviews = _scrape_sync(url, "en-US", LOCALES["en-US"], 1.0, 0, "newest", profile, known) or []
+    except Exception as e:
+        error = str(e)
+    wall = time.perf_counter() - t0
+    done.set()
+    sampler.join()
+    self_ru = resource.getrusage(resource.RUSAGE_SELF)
+    child_ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    out.put({
+        "wall": wall,
+        "reviews": len(reviews),
+        "cpu": self_ru.ru_utime + self_ru.ru_stime + child_ru.ru_utime + child_ru.ru_stime,
+        "peak_rss": peak[0] or max(self_ru.ru_maxrss, child_ru.ru_maxrss) * 1024,
+        "protocol_calls": calls[0],
+        "profile": profile,
+        "error": error,
+    })
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000], help="reviews on the fixture page")
+    ap.add_argument("--batch", type=int, default=10, help="cards loaded per scroll batch")
+    ap.add_argument("--latency-ms", type=int, default=50, help="server delay per batch request")
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--probe", action="store_true", help="also time a probe-only rerun per count")
+    args = ap.parse_args()
+
+    ctx = mp.get_context("spawn")
+    print(f"{'reviews':>8}{'got':>7}{'wall s':>9}{'cpu s':>8}{'peak MiB':>10}{'http':>7}{'driver':>8}{'scrolls':>9}  phases")
+    for count in args.counts:
+        for _ in range(args.repeat):
+            known = {} if args.probe else None  # {} probes without a baseline to record one
+            for label in ("", "probe") if args.probe else ("",):
+                state = _FixtureState(count, args.batch, args.latency_ms)
+                server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(state))
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                url = f"http://127.0.0.1:{server.server_address[1]}/maps/place?cid=bench"
+                q = ctx.Queue()
+                proc = ctx.Process(target=_run_one, args=(url, q, known))
+                proc.start()
+                res = q.get()
+                proc.join()
+                server.shutdown()
+                known = res["profile"].get("probe")
+                phases = " ".join(f"{k}={v}" for k, v in (res["profile"].get("phases") or {}).items())
+                print(
+                    f"{count:>8}{res['reviews']:>7}{res['wall']:>9.2f}{res['cpu']:>8.2f}"
+                    f"{res['peak_rss'] / 2**20:>10.0f}{state.requests:>7}{res['protocol_calls']:>8}"
+                    f"{res['profile'].get('scroll_iterations', 0):>9}  {phases} {label}".rstrip()
+                )
+                if res["error"]:
+                    print(f"         error: {res['error']}")
+
+
+if __name__ == "__main__":
+    main()
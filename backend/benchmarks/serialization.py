@@ -0,0 +1,95 @@
+"""Per-request serialization cost of review payloads: response_model path vs fast path.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization [--reviews 300] [--locales 7] [--iterations 200]
+"""
+import argparse
+import random
+import string
+import time
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.responses import FastJSONResponse, review_payloads, orjson
+from app.schemas import ReviewsResponse
+
+
+def _text(n: int) -> str:
+    return " ".join("".join(random.choices(string.ascii_lowercase, k=random.randint(2, 9))) for _ in range(n))
+
+
+def build_payloads(reviews: int, locales: int) -> list[dict]:
+    """Payloads shaped like `app.service._build_payload_from_db` output."""
+    out = []
+    for li in range(locales):
+        items = [
+            {
+                "reviewId": f"rid-{i}",
+                "name": _text(2),
+                "date": "2 months ago",
+                "stars": float(random.randint(1, 5)),
+                "text": _text(random.randint(5, 80)),
+                "avatar": f"https://lh3.googleusercontent.com/a/{i}=s120",
+                "profileLink": f"https://www.google.com/maps/contrib/{i}",
+            }
+            for i in range(reviews)
+        ]
+        out.append({
+            "success": True,
+            "locale": f"l{li}",
+            "count": len(items),
+            "averageRating": 4.2,
+            "reviews": items,
+            "params": {"min_rating": 1.0, "max_reviews": 0, "sort": "newest"},
+        })
+    return out
+
+
+def _response_model_path(adapter: TypeAdapter, payloads: list[dict]) -> bytes:
+    # What FastAPI does for `response_model=list[ReviewsResponse]`: validate, dump, json.dumps
+    validated = adapter.validate_python(payloads)
+    return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+
+def _fast_path(payloads: list[dict]) -> bytes:
+    return FastJSONResponse(review_payloads(payloads)).body
+
+
+def _measure(fn, iterations: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return sum(samples) / len(samples), samples[len(samples) // 2]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--reviews", type=int, default=300, help="reviews per locale")
+    ap.add_argument("--locales", type=int, default=7)
+    ap.add_argument("--iterations", type=int, default=200)
+    args = ap.parse_args()
+
+    random.seed(1)
+    payloads = build_payloads(args.reviews, args.locales)
+    adapter = TypeAdapter(list[ReviewsResponse])
+
+    before = _response_model_path(adapter, payloads)
+    after = _fast_path(payloads)
+    assert TypeAdapter(list[ReviewsResponse]).validate_json(after) == adapter.validate_json(before)
+
+    mean_b, p50_b = _measure(lambda: _response_model_path(adapter, payloads), args.iterations)
+    mean_a, p50_a = _measure(lambda: _fast_path(payloads), args.iterations)
+
+    print(f"payload: {args.locales} locales x {args.reviews} reviews, {len(after) / 1024:.0f} KiB, orjson={'yes' if orjson else 'no'}")
+    print(f"{'path':<16}{'mean ms':>10}{'p50 ms':>10}")
+    print(f"{'response_model':<16}{mean_b * 1000:>10.2f}{p50_b * 1000:>10.2f}")
+    print(f"{'fast':<16}{mean_a * 1000:>10.2f}{p50_a * 1000:>10.2f}")
+    print(f"speedup: {mean_b / mean_a:.1f}x")
+
+
+if __name__ == "__main__":
+    main()